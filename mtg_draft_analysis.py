@@ -1,20 +1,284 @@
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
-import random
+import numpy as np
 import time
 import json
+import os
+import multiprocessing
+import re
+import tempfile
+from functools import lru_cache
+from itertools import islice
 from tqdm import tqdm
 
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: without it the kernels below run as ordinary NumPy code
+    def njit(**kwargs):
+        return lambda func: func
+
+try:
+    import polars as pl
+except ImportError:
+    # Polars is optional: without it analyze_drafts aggregates with pandas
+    pl = None
+else:
+    # Before 1.0, partition_by(as_dict=True) keys a single partition column by scalar, not tuple
+    if int(pl.__version__.split(".")[0]) < 1:
+        pl = None
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    # PyArrow is optional: without it results are written with pandas' CSV writer
+    pa = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional: without it the analysis is written with the json module
+    orjson = None
+
+SCRYFALL_API = "https://api.scryfall.com"
+
+# Most identifiers the /cards/collection endpoint accepts in one request
+SCRYFALL_COLLECTION_LIMIT = 75
+
+# Scryfall set data is cached here so repeat runs skip the network entirely
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "mtg_draft")
+
+# Bit assigned to each color in the per-card color masks used while building decks
+COLOR_BITS = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16}
+
+# Rarities from lowest to highest; a card's rank in this list is also its deck-building bonus
+RARITY_ORDER = ["common", "uncommon", "rare", "mythic"]
+
+# Fewest drafts worth handing to a worker process; smaller runs stay in the current process
+MIN_DRAFTS_PER_WORKER = 250
+
+class _RateLimiter:
+    """Block just long enough to keep successive calls at least `interval` seconds apart"""
+    
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self._last_call = float("-inf")
+    
+    def wait(self):
+        now = time.monotonic()
+        delay = self._last_call + self.interval - now
+        if delay > 0:
+            time.sleep(delay)
+            now += delay
+        self._last_call = now
+
+# Scryfall asks clients to stay under 10 requests per second; shared by every API call
+_scryfall_limiter = _RateLimiter(interval=0.1)
+
+def _make_session():
+    """Create a keep-alive HTTP session configured for the Scryfall API"""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=20))
+    session.headers.update({
+        "User-Agent": "MTGDraftAnalysis/1.0",
+        "Accept": "application/json"
+    })
+    return session
+
+@lru_cache(maxsize=8)
+def _fetch_set(set_code):
+    """
+    Return the booster cards of a set, from the disk cache when available,
+    otherwise from the Scryfall API (the result is then written to the cache)
+    """
+    cache_path = os.path.join(CACHE_DIR, f"{set_code.lower()}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r") as f:
+            return json.load(f)
+    
+    cards = []
+    url = f"{SCRYFALL_API}/cards/search?q=set:{set_code}+is:booster"
+    with _make_session() as session:
+        # Follow the pages until Scryfall reports there are no more
+        while url:
+            _scryfall_limiter.wait()
+            response = session.get(url, timeout=10)
+            response.raise_for_status()
+            data = response.json()
+            cards.extend(data.get("data", []))
+            url = data.get("next_page") if data.get("has_more", False) else None
+    
+    # Write to a temporary file first so an interrupted run never leaves a partial cache
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=CACHE_DIR, suffix=".tmp", delete=False) as f:
+        json.dump(cards, f)
+    os.replace(f.name, cache_path)
+    
+    return cards
+
+@njit(cache=True)
+def _score_pool(colors, cmc, rarity_ord, is_creature, is_land, has_removal, keyword_hits,
+                primary_mask, creature_weight, noncreature_weight):
+    """Score every card of a pool from its precomputed columns (see build_deck)"""
+    score = (
+        5.0 * ((colors & primary_mask) != 0) +         # Cards in our primary colors
+        3.0 * (colors == primary_mask) +               # Cards exactly in our colors
+        3.0 * ((colors == 0) & ~is_land) +             # Colorless cards are good in any deck
+        rarity_ord +                                   # Rarer cards are generally better
+        np.where(cmc <= 3, 2.0, np.where(cmc <= 5, 1.0, 0.0)) +  # Lower cost is generally better
+        1.0 * is_creature +                            # We need creatures
+        2.0 * has_removal +                            # Removal is valuable
+        keyword_hits                                   # Archetype-specific keywords
+    )
+    # Apply archetype-specific weights
+    return score * np.where(is_creature, creature_weight, noncreature_weight)
+
+def _archetype_cmc_hist(arch_codes, cmc, n_archetypes, max_cmc):
+    """Count the cards of every (archetype code, mana value) pair in a single bincount pass"""
+    width = max_cmc + 1
+    return np.bincount(arch_codes * width + cmc, minlength=n_archetypes * width).reshape(n_archetypes, width)
+
+def _mana_curves_by_archetype(df):
+    """Return the mana curve ({cmc: card count}) of each archetype in df, keyed by archetype"""
+    cmc = df["cmc"].to_numpy(dtype=float)
+    if not np.all((cmc >= 0) & (cmc == np.floor(cmc))):
+        # Missing or fractional mana values don't fit a histogram, so group them instead
+        cmc_by_arch = df.groupby(["archetype", "cmc"], observed=True).size()
+        return {archetype: cmc_by_arch.loc[archetype].to_dict()
+                for archetype in cmc_by_arch.index.unique("archetype")}
+    
+    archetypes = df["archetype"].cat.categories
+    hist = _archetype_cmc_hist(df["archetype"].cat.codes.to_numpy().astype(np.int64),
+                               cmc.astype(np.int64), len(archetypes), int(cmc.max(initial=0)))
+    cmc_values = np.arange(hist.shape[1]).astype(df["cmc"].dtype)
+    curves = {}
+    for archetype, counts in zip(archetypes, hist):
+        present = np.flatnonzero(counts)
+        curves[archetype] = dict(zip(cmc_values[present].tolist(), counts[present].tolist()))
+    return curves
+
+def _top_k(candidates, score, k):
+    """
+    Return the k highest scored of the candidate positions, highest first with ties in
+    candidate order (the same as a stable sort followed by [:k], without sorting everything)
+    """
+    if len(candidates) > k:
+        # Only candidates scoring at least the k-th best score can make the cut
+        threshold = np.partition(score[candidates], -k)[-k]
+        candidates = candidates[score[candidates] >= threshold]
+    return candidates[np.argsort(-score[candidates], kind="stable")[:k]]
+
+def _sample_packs(rng, population, k, packs):
+    """
+    Draw k distinct cards from population for each of the packs in one call: the k
+    smallest of a row of random keys form a uniform sample without replacement
+    """
+    keys = rng.random((packs, len(population)))
+    return population[np.argpartition(keys, k - 1, axis=1)[:, :k]]
+
+# Simulator shared by the drafts a worker process runs, set once when the worker starts
+_worker_simulator = None
+
+def _init_worker(simulator):
+    global _worker_simulator
+    _worker_simulator = simulator
+
+def _simulate_chunk_in_worker(chunk):
+    return _worker_simulator._simulate_chunk(*chunk)
+
+def _polars_counts(frame, column):
+    """Count each value of a column, most common first with ties in first-seen order (as pandas value_counts)"""
+    counts = frame.group_by(column, maintain_order=True).len().drop_nulls(column)
+    return counts.sort("len", descending=True, maintain_order=True)
+
+def _polars_to_dict(counts):
+    keys, values = counts.columns
+    return dict(zip(counts[keys].to_list(), counts[values].to_list()))
+
+def _summarize_drafts_polars(df):
+    """Compute analyze_drafts' analysis dict from a Polars frame of the analyzed cards"""
+    analysis = {}
+    
+    # Card frequency
+    analysis["most_common_cards"] = _polars_to_dict(_polars_counts(df, "card_name").head(20))
+    
+    # Color distribution
+    if "colors" in df.columns:
+        analysis["color_distribution"] = _polars_to_dict(_polars_counts(df, "colors"))
+    
+    # Card type distribution
+    df = df.with_columns(
+        pl.col("type_line").str.split_exact("—", 1).struct.field("field_0")
+        .str.strip_chars().fill_null("Unknown").alias("main_type")
+    )
+    analysis["type_distribution"] = _polars_to_dict(_polars_counts(df, "main_type"))
+    
+    # Mana curve analysis
+    if "cmc" in df.columns:
+        mana_curve = df.group_by("cmc").len().drop_nulls("cmc").sort("cmc")
+        analysis["mana_curve"] = _polars_to_dict(mana_curve)
+    
+    # Rarity distribution
+    if "rarity" in df.columns:
+        analysis["rarity_distribution"] = _polars_to_dict(_polars_counts(df, "rarity"))
+    
+    # Archetype analysis (if we used multiple archetypes)
+    archetypes = df["archetype"].unique(maintain_order=True).to_list() if "archetype" in df.columns else []
+    if len(archetypes) > 1:
+        # Every card of a deck shares its archetype, so one row per deck is enough
+        decks = df.select("archetype").filter(df["deck_id"].is_first_distinct())
+        analysis["archetype_distribution"] = _polars_to_dict(_polars_counts(decks, "archetype"))
+        
+        # Count cards and mana values for every archetype in one grouped pass each
+        card_by_arch = df.group_by(["archetype", "card_name"], maintain_order=True).len().partition_by(
+            "archetype", maintain_order=True, include_key=False, as_dict=True
+        )
+        if "cmc" in df.columns:
+            cmc_by_arch = df.group_by(["archetype", "cmc"]).len().drop_nulls("cmc").sort("cmc").partition_by(
+                "archetype", maintain_order=True, include_key=False, as_dict=True
+            )
+        
+        # Analyze each archetype separately
+        for archetype in archetypes:
+            # Most common cards in this archetype
+            arch_card_counts = card_by_arch[(archetype,)].sort("len", descending=True, maintain_order=True)
+            analysis[f"most_common_cards_{archetype}"] = _polars_to_dict(arch_card_counts.head(10))
+            
+            # Mana curve for this archetype
+            if "cmc" in df.columns:
+                analysis[f"mana_curve_{archetype}"] = _polars_to_dict(cmc_by_arch[(archetype,)])
+    
+    return analysis
+
+def _top_counts(counts, labels, candidates, k):
+    """
+    Return {label: count} for the k largest counts among the candidate positions, largest
+    first with ties in candidate order (so first-seen candidates match value_counts().head(k))
+    """
+    top = _top_k(candidates, counts, k)
+    return dict(zip(labels[top].tolist(), counts[top].tolist()))
+
 class DraftSimulator:
     """
     A class to simulate MTG sealed deck building and analyze the results.
     Uses the Scryfall API to get card data.
     """
     
-    def __init__(self, set_code="tdm"):
+    # Basic land for each color code
+    _BASIC_LAND = {"W": "Plains", "U": "Island", "B": "Swamp", "R": "Mountain", "G": "Forest"}
+    
+    def __init__(self, set_code="tdm", seed=None):
         self.set_code = set_code
         self.cards_in_set = []
         self.card_data = {}
+        self._set_idx = np.empty(0, dtype=np.int32)
+        self._common_idx = np.empty(0, dtype=np.int32)
+        self._uncommon_idx = np.empty(0, dtype=np.int32)
+        self._rare_idx = np.empty(0, dtype=np.int32)
+        # One generator for all the simulator's randomness; pass a seed for reproducible runs
+        self._rng = np.random.default_rng(seed)
         self.sealed_pool_size = 90  # 6 boosters × 15 cards
         self.deck_size = 23  # Non-land cards only (17 lands would be added separately)
         self.basic_lands = ["Plains", "Island", "Swamp", "Mountain", "Forest"]
@@ -266,69 +530,152 @@ class DraftSimulator:
                 "min_creatures": 14
             }
         }
+        # One precompiled pattern per archetype; the lookahead lets overlapping keywords
+        # (e.g. "trample" and "ramp") all be found in a single scan of the oracle text
+        self._archetype_kw_re = {
+            archetype: re.compile("(?=(" + "|".join(re.escape(k) for k in weights["keywords"]) + "))")
+            for archetype, weights in self.archetype_weights.items()
+        }
+        # Keep-alive session for any further Scryfall requests, opened on first use
+        self._session = None
         self.load_set_data()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the HTTP session used for Scryfall requests, if one was opened"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def __getstate__(self):
+        # Worker processes get the card data but not the HTTP session
+        state = self.__dict__.copy()
+        state["_session"] = None
+        return state
+    
     def load_set_data(self):
-        """Load all cards from the specified set via Scryfall API"""
-        url = f"https://api.scryfall.com/cards/search?q=set:{self.set_code}+is:booster"
-        response = requests.get(url)
+        """Load all cards from the specified set (cached on disk after the first Scryfall download)"""
+        try:
+            self.cards_in_set = list(_fetch_set(self.set_code))
+        except requests.RequestException as e:
+            print(f"Error loading set data: {e}")
+            return
         
-        if response.status_code == 200:
-            data = response.json()
-            self.cards_in_set = data.get("data", [])
-            
-            # Get all pages if there are more
-            while data.get("has_more", False):
-                next_page = data.get("next_page")
-                response = requests.get(next_page)
-                if response.status_code == 200:
-                    data = response.json()
-                    self.cards_in_set.extend(data.get("data", []))
-                else:
-                    break
-                    
-            # Create a more efficient data structure for the cards
-            for card in self.cards_in_set:
-                self.card_data[card["name"]] = {
-                    "name": card["name"],
-                    "mana_cost": card.get("mana_cost", ""),
-                    "type_line": card.get("type_line", ""),
-                    "oracle_text": card.get("oracle_text", ""),
-                    "colors": card.get("colors", []),
-                    "color_identity": card.get("color_identity", []),
-                    "rarity": card.get("rarity", ""),
-                    "cmc": card.get("cmc", 0)
-                }
-            
-            print(f"Loaded {len(self.cards_in_set)} cards from set {self.set_code}")
-        else:
-            print(f"Error loading set data: {response.status_code}")
+        # Create a more efficient data structure for the cards
+        for card in self.cards_in_set:
+            mana_cost = card.get("mana_cost", "")
+            oracle_text = card.get("oracle_text", "")
+            type_line = card.get("type_line", "")
+            self.card_data[card["name"]] = {
+                "name": card["name"],
+                "mana_cost": mana_cost,
+                "type_line": type_line,
+                "oracle_text": oracle_text,
+                "colors": card.get("colors", []),
+                "color_identity": card.get("color_identity", []),
+                "rarity": card.get("rarity", ""),
+                "cmc": card.get("cmc", 0),
+                # Derived once here instead of on every deck build
+                "oracle_lower": oracle_text.lower(),
+                "mana_symbols": {color: mana_cost.count(color) for color in "WUBRG"},
+                "is_creature": "Creature" in type_line,
+                "is_land": "Land" in type_line
+            }
+        
+        # Column-oriented view of the set, computed once with pandas, that build_deck
+        # indexes by card position to score a whole sealed pool with NumPy
+        template = pd.DataFrame(list(self.card_data.values()))
+        oracle_lower = template["oracle_lower"]
+        color_key = template["colors"].str.join("")
+        
+        self._card_index = {name: i for i, name in enumerate(template["name"])}
+        self._card_records = template[
+            ["name", "colors", "cmc", "type_line", "rarity", "oracle_text", "mana_cost"]
+        ].to_dict("records")
+        self._card_colors = sum(
+            color_key.str.contains(color, regex=False).to_numpy(dtype=np.uint8) * bit
+            for color, bit in COLOR_BITS.items()
+        ).astype(np.uint8)
+        self._card_cmc = template["cmc"].to_numpy(dtype=float)
+        self._card_mana_symbols = np.array(
+            [[symbols[c] for c in "WUBRG"] for symbols in template["mana_symbols"]], dtype=int
+        ).reshape(-1, 5)
+        self._card_is_creature = template["is_creature"].to_numpy(dtype=bool)
+        self._card_is_land = template["is_land"].to_numpy(dtype=bool)
+        self._card_rarity_ord = template["rarity"].map(
+            {rarity: rank for rank, rarity in enumerate(RARITY_ORDER)}
+        ).fillna(0).to_numpy(dtype=np.uint8)
+        self._card_has_removal = (template["type_line"].str.contains("Removal", regex=False) |
+                                  oracle_lower.str.contains("destroy|exile|damage|-|fight")).to_numpy()
+        
+        # Keyword hits only depend on the card, so count them once per archetype for the
+        # whole set; each distinct keyword found in the oracle text is worth one point
+        self._card_keyword_hits = {
+            archetype: np.array([len(set(pattern.findall(text))) for text in oracle_lower], dtype=int)
+            for archetype, pattern in self._archetype_kw_re.items()
+        }
+        
+        # Partition the set by rarity once so booster generation doesn't rescan it per pack;
+        # packs are drawn as positions into the precomputed card columns
+        self._set_idx = np.array([self._card_index[card["name"]] for card in self.cards_in_set], dtype=np.int32)
+        set_rarity = np.array([card["rarity"] for card in self.cards_in_set])
+        self._common_idx = self._set_idx[set_rarity == "common"]
+        self._uncommon_idx = self._set_idx[set_rarity == "uncommon"]
+        self._rare_idx = self._set_idx[np.isin(set_rarity, ["rare", "mythic"])]
+        
+        print(f"Loaded {len(self.cards_in_set)} cards from set {self.set_code}")
     
-    def generate_sealed_pool(self):
-        """Generate a sealed pool of 90 cards (6 boosters)"""
+    def _fetch_cards_by_name(self, names):
+        """
+        Fetch the Scryfall card objects for a list of card names, batching the names
+        through the /cards/collection endpoint instead of requesting cards one by one
+        """
+        if self._session is None:
+            self._session = _make_session()
+        cards = []
+        for start in range(0, len(names), SCRYFALL_COLLECTION_LIMIT):
+            batch = names[start:start + SCRYFALL_COLLECTION_LIMIT]
+            _scryfall_limiter.wait()
+            response = self._session.post(
+                f"{SCRYFALL_API}/cards/collection",
+                json={"identifiers": [{"name": name} for name in batch]},
+                timeout=10
+            )
+            response.raise_for_status()
+            cards.extend(response.json().get("data", []))
+        return cards
+    
+    def generate_sealed_pool(self, rng=None):
+        """
+        Generate a sealed pool of 90 cards (6 boosters)
+        Returns the pool as an array of card positions, the form build_deck works on
+        
+        Parameters:
+        - rng: numpy Generator to draw the packs from (defaults to the simulator's own)
+        """
         if not self.cards_in_set:
             raise ValueError("No cards loaded. Please load set data first.")
         
-        sealed_pool = []
+        rng = self._rng if rng is None else rng
+        packs = 6  # 6 booster packs
         
         # Simplified booster pack generation - in reality, this would be more complex
-        # with proper rarity distribution, but this is a reasonable approximation
-        for _ in range(6):  # 6 booster packs
-            commons = [card for card in self.cards_in_set if card["rarity"] == "common"]
-            uncommons = [card for card in self.cards_in_set if card["rarity"] == "uncommon"]
-            rares = [card for card in self.cards_in_set if card["rarity"] in ["rare", "mythic"]]
-            
-            # Each pack has roughly: 10 commons, 3 uncommons, 1 rare/mythic, 1 land
-            pack = (
-                random.sample(commons, 10) +
-                random.sample(uncommons, 3) +
-                random.sample(rares, 1) +
-                [random.choice(self.cards_in_set)]  # Simplified land slot
-            )
-            
-            sealed_pool.extend(pack)
+        # with proper rarity distribution, but this is a reasonable approximation.
+        # Each pack has roughly: 10 commons, 3 uncommons, 1 rare/mythic, 1 land,
+        # with every slot drawn for all the packs at once
+        sealed_pool = np.column_stack([
+            _sample_packs(rng, self._common_idx, 10, packs),
+            _sample_packs(rng, self._uncommon_idx, 3, packs),
+            _sample_packs(rng, self._rare_idx, 1, packs),
+            rng.choice(self._set_idx, size=(packs, 1))  # Simplified land slot
+        ])
         
-        return sealed_pool
+        return sealed_pool.ravel().astype(np.intp)
     
     def build_deck(self, sealed_pool, archetype="auto"):
         """
@@ -336,7 +683,7 @@ class DraftSimulator:
         This method can build decks using different archetypal strategies
         
         Parameters:
-        - sealed_pool: list of cards in the sealed pool
+        - sealed_pool: array of card positions in the sealed pool, as returned by generate_sealed_pool
         - archetype: string identifying the deck archetype to build
                     - "auto": automatically determine best colors (default)
                     - "WU", "UB", etc: two-color archetypes
@@ -344,41 +691,22 @@ class DraftSimulator:
                     - "MONO_W", "MONO_U", etc: mono-color archetypes
                     - "5C": five-color archetype
         """
-        # Extract only the necessary card information
-        pool_data = [{
-            "name": card["name"],
-            "colors": card.get("colors", []),
-            "cmc": card.get("cmc", 0),
-            "type_line": card.get("type_line", ""),
-            "rarity": card.get("rarity", ""),
-            "oracle_text": card.get("oracle_text", ""),
-            "mana_cost": card.get("mana_cost", "")
-        } for card in sealed_pool]
-        
-        # Count cards by color
-        color_counts = {"W": 0, "U": 0, "B": 0, "R": 0, "G": 0, "colorless": 0, "multicolor": 0}
-        for card in pool_data:
-            colors = card["colors"]
-            if len(colors) == 0:
-                color_counts["colorless"] += 1
-            elif len(colors) > 1:
-                color_counts["multicolor"] += 1
-                # Also increment individual colors
-                for color in colors:
-                    color_counts[color] += 1
-            else:
-                color_counts[colors[0]] += 1
+        # Positions of the pool's cards in the precomputed set columns
+        idx = np.asarray(sealed_pool, dtype=np.intp)
+        pool_colors = self._card_colors[idx]  # Color bitmasks, see COLOR_BITS
+        is_creature = self._card_is_creature[idx]
+        is_land = self._card_is_land[idx]
+        is_colorless = pool_colors == 0
+        
+        # Count cards by color (multicolor cards count towards each of their colors)
+        color_counts = {color: int(np.count_nonzero(pool_colors & bit)) for color, bit in COLOR_BITS.items()}
         
         # Determine primary colors based on archetype
         primary_colors = []
         
         if archetype == "auto":
             # Find the two colors with the most cards
-            sorted_colors = sorted(
-                [c for c in color_counts.keys() if c not in ["colorless", "multicolor"]],
-                key=lambda c: color_counts[c], 
-                reverse=True
-            )
+            sorted_colors = sorted(color_counts.keys(), key=lambda c: color_counts[c], reverse=True)
             primary_colors = sorted_colors[:2]
         elif archetype in ["WU", "UB", "BR", "RG", "GW", "WB", "UR", "BG", "RW", "GU"]:
             # Two-color archetype
@@ -394,171 +722,92 @@ class DraftSimulator:
             primary_colors = ["W", "U", "B", "R", "G"]
         else:
             # Default to auto if archetype not recognized
-            sorted_colors = sorted(
-                [c for c in color_counts.keys() if c not in ["colorless", "multicolor"]],
-                key=lambda c: color_counts[c], 
-                reverse=True
-            )
+            sorted_colors = sorted(color_counts.keys(), key=lambda c: color_counts[c], reverse=True)
             primary_colors = sorted_colors[:2]
             
         print(f"Building {self.archetypes.get(archetype, 'Unknown')} deck with colors: {', '.join(primary_colors)}")
         
-        # Score cards based on archetype preferences
-        for card in pool_data:
-            # Start with base score
-            card["score"] = 0
-            
-            # Higher score for cards in our primary colors
-            if any(color in primary_colors for color in card.get("colors", [])):
-                card["score"] += 5
-            
-            # Even higher score if card is exactly in our colors
-            if set(card.get("colors", [])) == set(primary_colors):
-                card["score"] += 3
-                
-            # Colorless cards are good in any deck
-            if len(card.get("colors", [])) == 0 and "Land" not in card["type_line"]:
-                card["score"] += 3
-                
-            # Rarity bonus - generally rarer cards are better
-            rarity_bonus = {"common": 0, "uncommon": 1, "rare": 2, "mythic": 3}
-            card["score"] += rarity_bonus.get(card.get("rarity", "common"), 0)
-            
-            # Lower cost is generally better
-            if card.get("cmc", 0) <= 3:
-                card["score"] += 2
-            elif card.get("cmc", 0) <= 5:
-                card["score"] += 1
-                
-            # Card type considerations
-            if "Creature" in card["type_line"]:
-                card["score"] += 1  # We need creatures
-            if "Removal" in card["type_line"] or any(term in card.get("oracle_text", "").lower() 
-                                                   for term in ["destroy", "exile", "damage", "-", "fight"]):
-                card["score"] += 2  # Removal is valuable
-                
-            # Archetype-specific keywords
-            if archetype in self.archetype_weights:
-                keywords = self.archetype_weights[archetype]["keywords"]
-                oracle_text = card.get("oracle_text", "").lower()
-                
-                # Check for archetype-specific keywords
-                for keyword in keywords:
-                    if keyword in oracle_text:
-                        card["score"] += 1
-                
-                # Apply archetype-specific weights
-                if "Creature" in card["type_line"]:
-                    card["score"] *= self.archetype_weights[archetype]["creature_weight"]
-                else:
-                    card["score"] *= self.archetype_weights[archetype]["noncreature_weight"]
-            
-        # Select cards in our primary colors plus colorless cards
-        playable_cards = []
-        for card in pool_data:
-            # Include lands that produce our colors
-            if "Land" in card["type_line"]:
-                # For simplicity, assuming most lands in the pool are usable
-                playable_cards.append(card)
-                continue
-                
-            # Include cards of our primary colors or colorless cards
-            if (len(card["colors"]) == 0 or 
-                any(color in primary_colors for color in card["colors"]) or
-                (all(color in primary_colors for color in card["colors"]))):
-                playable_cards.append(card)
+        # Score the whole pool at once based on archetype preferences
+        primary_mask = sum(COLOR_BITS[color] for color in set(primary_colors))
+        on_color = (pool_colors & primary_mask) != 0
+        
+        # Look up the archetype's weights once for the whole build
+        weights = self.archetype_weights.get(archetype)
+        if weights:
+            keyword_hits = self._card_keyword_hits[archetype][idx]
+            creature_weight = weights["creature_weight"]
+            noncreature_weight = weights["noncreature_weight"]
+        else:
+            keyword_hits = np.zeros(len(idx), dtype=int)
+            creature_weight = noncreature_weight = 1.0
+        
+        score = _score_pool(pool_colors, self._card_cmc[idx], self._card_rarity_ord[idx],
+                            is_creature, is_land, self._card_has_removal[idx], keyword_hits,
+                            primary_mask, creature_weight, noncreature_weight)
         
-        # Sort by score (highest first)
-        playable_cards.sort(key=lambda c: c["score"], reverse=True)
+        # Select lands (for simplicity, assuming most lands in the pool are usable),
+        # colorless cards and cards sharing a color with our primary colors, reusing the
+        # bitmask tests from scoring (a subset of the primary colors is always on-color)
+        playable_cards = np.flatnonzero(is_land | is_colorless | on_color)
         
         # Ensure we have enough creatures (aim for 14-18 creatures typically)
-        min_creatures = 14
-        if archetype in self.archetype_weights:
-            min_creatures = self.archetype_weights[archetype].get("min_creatures", 14)
+        min_creatures = weights.get("min_creatures", 14) if weights else 14
             
         # First, take the highest scored cards up to 23
-        if len(playable_cards) > 23:
-            potential_cards = playable_cards[:23]
-        else:
-            potential_cards = playable_cards
+        potential_cards = _top_k(playable_cards, score, 23)
             
         # Count creatures
-        creature_count = sum(1 for card in potential_cards if "Creature" in card["type_line"])
+        creature_count = int(is_creature[potential_cards].sum())
         
         # If we don't have enough creatures, try to add more
         if creature_count < min_creatures:
             needed_creatures = min_creatures - creature_count
             
             # Find creatures in our playable cards that weren't selected
-            additional_creatures = [card for card in playable_cards[23:] 
-                                  if "Creature" in card["type_line"]][:needed_creatures]
+            unselected = np.ones(len(score), dtype=bool)
+            unselected[potential_cards] = False
+            remaining_creatures = playable_cards[unselected[playable_cards] & is_creature[playable_cards]]
+            additional_creatures = _top_k(remaining_creatures, score, needed_creatures)
             
-            # Remove lowest scored non-creatures to make room for creatures
-            non_creatures = [card for card in potential_cards 
-                           if "Creature" not in card["type_line"]]
-            non_creatures.sort(key=lambda c: c["score"])
-            
-            # Remove lowest scored non-creatures
-            for _ in range(min(len(additional_creatures), len(non_creatures))):
-                potential_cards.remove(non_creatures.pop(0))
+            # Mark the lowest scored non-creatures (by position) to make room for creatures
+            non_creatures = np.flatnonzero(~is_creature[potential_cards])
+            non_creatures = non_creatures[np.argsort(score[potential_cards[non_creatures]], kind="stable")]
+            keep = np.ones(len(potential_cards), dtype=bool)
+            keep[non_creatures[:len(additional_creatures)]] = False
                 
             # Add better creatures
-            potential_cards.extend(additional_creatures)
+            potential_cards = np.concatenate([potential_cards[keep], additional_creatures])
         
         # These are our 23 non-land cards
-        selected_cards = potential_cards[:23] if len(potential_cards) > 23 else potential_cards
+        potential_cards = potential_cards[:23]
+        selected_cards = [dict(self._card_records[i], score=s)
+                          for i, s in zip(idx[potential_cards].tolist(), score[potential_cards].tolist())]
         
         # Calculate land distribution based on color requirements, but don't add them to the deck
         # We're aiming for 23 non-land cards, with 17 lands assumed to be added separately
         lands_needed = 17  # Fixed at 17 lands instead of calculating from 40 - len(selected_cards)
         
         # Count mana symbols in selected cards to determine land distribution
-        mana_symbols = {"W": 0, "U": 0, "B": 0, "R": 0, "G": 0}
-        for card in selected_cards:
-            # Look at mana costs to count color requirements
-            mana_cost = card.get("mana_cost", "")
-            for color in primary_colors:
-                # Count color symbols in mana cost (approximate)
-                mana_symbols[color] += mana_cost.count(color)
+        # (from each card's precomputed color symbol counts, approximate)
+        mana_symbols = dict(zip("WUBRG", self._card_mana_symbols[idx[potential_cards]].sum(axis=0).tolist()))
         
-        # Distribute lands based on color requirements
-        total_colored_symbols = sum(mana_symbols[color] for color in primary_colors)
+        # Distribute lands based on color requirements: each color gets its share of the
+        # colored mana symbols (rounded down) and the color with the most mana symbols
+        # takes whatever is left over
+        color_demand = np.array([mana_symbols[color] for color in primary_colors])
+        total_colored_symbols = color_demand.sum()
         
         if total_colored_symbols == 0:  # Failsafe if no colored symbols
             # Equal distribution for primary colors
-            if len(primary_colors) == 1:
-                # Mono-color deck
-                lands = [{"name": self.basic_land_name(primary_colors[0]), 
-                          "type_line": "Basic Land"}] * lands_needed
-            else:
-                # Multi-color deck, distribute evenly
-                lands = []
-                lands_per_color = lands_needed // len(primary_colors)
-                for color in primary_colors:
-                    lands.extend([{"name": self.basic_land_name(color), 
-                                  "type_line": "Basic Land"}] * lands_per_color)
+            land_counts = np.full(len(primary_colors), lands_needed // len(primary_colors))
         else:
             # Distribute according to color requirements
-            lands = []
-            for color in primary_colors:
-                color_ratio = mana_symbols[color] / total_colored_symbols if total_colored_symbols > 0 else 1/len(primary_colors)
-                land_count = int(lands_needed * color_ratio)
-                lands.extend([{"name": self.basic_land_name(color), 
-                              "type_line": "Basic Land"}] * land_count)
-        
-        # Adjust if we don't have exactly lands_needed lands
-        while len(lands) < lands_needed:
-            # Add lands of the color with the most mana symbols
-            most_demanding_color = max(primary_colors, key=lambda c: mana_symbols[c])
-            lands.append({"name": self.basic_land_name(most_demanding_color), "type_line": "Basic Land"})
-            
-        while len(lands) > lands_needed:
-            # Remove lands of the color with the least mana symbols
-            least_demanding_color = min(primary_colors, key=lambda c: mana_symbols[c])
-            for i, land in enumerate(lands):
-                if land["name"] == self.basic_land_name(least_demanding_color):
-                    lands.pop(i)
-                    break
+            land_counts = np.floor(lands_needed * (color_demand / total_colored_symbols)).astype(int)
+        land_counts[np.argmax(color_demand)] += lands_needed - land_counts.sum()
+        
+        lands = []
+        for color, land_count in zip(primary_colors, land_counts.tolist()):
+            lands.extend([{"name": self._BASIC_LAND.get(color, "Wastes"), "type_line": "Basic Land"}] * land_count)
         
         # We're only returning the non-land cards - lands are calculated but not included
         # Keeping land calculation for potential future use
@@ -567,14 +816,24 @@ class DraftSimulator:
     
     def basic_land_name(self, color):
         """Return the basic land name for a given color"""
-        if color == "W": return "Plains"
-        if color == "U": return "Island"
-        if color == "B": return "Swamp"
-        if color == "R": return "Mountain"
-        if color == "G": return "Forest"
-        return "Wastes"  # Colorless basic land
-    
-    def simulate_drafts(self, num_drafts=100, archetype="auto", archetype_distribution=None):
+        return self._BASIC_LAND.get(color, "Wastes")  # Wastes is the colorless basic land
+    
+    def _simulate_chunk(self, first_draft, archetypes, seeds):
+        """Simulate a run of consecutive drafts, each from its own archetype and seed"""
+        decks = []
+        for i, (current_archetype, seed) in enumerate(zip(archetypes, seeds), start=first_draft):
+            sealed_pool = self.generate_sealed_pool(np.random.default_rng(seed))
+            deck = self.build_deck(sealed_pool, current_archetype)
+            
+            # Add metadata about the deck
+            for card in deck:
+                card["archetype"] = current_archetype
+                card["draft_number"] = i
+                
+            decks.append(deck)
+        return decks
+    
+    def simulate_drafts(self, num_drafts=100, archetype="auto", archetype_distribution=None, n_jobs=None):
         """
         Simulate multiple drafts and collect data
         
@@ -583,9 +842,9 @@ class DraftSimulator:
         - archetype: specific archetype to use for all decks
         - archetype_distribution: dict mapping archetype names to percentages 
                                 (e.g., {"WU": 0.25, "UB": 0.25, "RG": 0.5})
+        - n_jobs: most worker processes to spread the drafts over (defaults to one per CPU);
+                  each worker gets at least MIN_DRAFTS_PER_WORKER drafts
         """
-        all_decks = []
-        
         # If using a distribution, validate it sums to approximately 1
         if archetype_distribution:
             total = sum(archetype_distribution.values())
@@ -594,76 +853,97 @@ class DraftSimulator:
                 # Normalize values
                 archetype_distribution = {k: v/total for k, v in archetype_distribution.items()}
         
-        for i in tqdm(range(num_drafts), desc="Simulating Drafts"):
-            sealed_pool = self.generate_sealed_pool()
-            
-            # Determine which archetype to use for this draft
-            current_archetype = archetype
-            if archetype_distribution:
-                # Choose a random archetype based on the distribution
-                r = random.random()
-                cumulative = 0
-                for arch, prob in archetype_distribution.items():
-                    cumulative += prob
-                    if r <= cumulative:
-                        current_archetype = arch
-                        break
-            
-            deck = self.build_deck(sealed_pool, current_archetype)
-            
-            # Add metadata about the deck
-            for card in deck:
-                card["archetype"] = current_archetype
-                card["draft_number"] = i
-                
-            all_decks.append(deck)
-            # No need for sleep here since we're not making API calls during simulation
+        # Determine which archetype to use for each draft up front
+        if archetype_distribution:
+            # Choose a random archetype for every draft based on the distribution in one call
+            arch_codes = np.array(list(archetype_distribution))
+            probs = np.fromiter(archetype_distribution.values(), dtype=np.float64)
+            archetypes = self._rng.choice(arch_codes, size=num_drafts, p=probs / probs.sum()).tolist()
+        else:
+            archetypes = [archetype] * num_drafts
+        
+        # Every draft gets its own seed, so the decks don't depend on how they are split up
+        seeds = np.random.SeedSequence(int(self._rng.integers(2**63))).spawn(num_drafts)
+        
+        workers = max(1, min(n_jobs or os.cpu_count() or 1, num_drafts // MIN_DRAFTS_PER_WORKER))
+        chunk_size = -(-num_drafts // (workers * 4)) if workers > 1 else 1
+        chunks = [(start, archetypes[start:start + chunk_size], seeds[start:start + chunk_size])
+                  for start in range(0, num_drafts, chunk_size)]
+        
+        all_decks = []
+        with tqdm(total=num_drafts, desc="Simulating Drafts") as progress:
+            if workers == 1:
+                for decks in (self._simulate_chunk(*chunk) for chunk in chunks):
+                    all_decks.extend(decks)
+                    progress.update(len(decks))
+            else:
+                # Drafts are independent, so run them across processes that each receive
+                # the simulator once
+                with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+                    for decks in pool.imap(_simulate_chunk_in_worker, chunks):
+                        all_decks.extend(decks)
+                        progress.update(len(decks))
+        # No need for sleep here since we're not making API calls during simulation
         
         return all_decks
     
     def analyze_drafts(self, decks):
-        """Analyze the drafted decks using pandas"""
-        # Flatten the data for analysis
-        card_records = []
+        """Analyze the drafted decks using pandas (aggregating with Polars when it is installed)"""
+        # Flatten the data for analysis: gather each record field as one column list
+        # and build the frame once instead of appending a dict per card
+        cards = [card for deck in decks for card in deck]
+        data = {
+            "deck_id": np.repeat(np.arange(len(decks)), [len(deck) for deck in decks]),
+            "card_name": [card["name"] for card in cards],
+            "type_line": [card.get("type_line", "Unknown") for card in cards],
+            "archetype": [card.get("archetype", "auto") for card in cards],
+            "draft_number": [card.get("draft_number", 0) for card in cards],
+            # Add color information if available
+            "colors": [(",".join(card["colors"]) or "Colorless") if "colors" in card else
+                       "Basic Land" if "Land" in card.get("type_line", "") else "Unknown"
+                       for card in cards],
+            "color_count": [len(card.get("colors", ())) for card in cards]
+        }
         
-        for deck_index, deck in enumerate(decks):
-            for card in deck:
-                # Skip basic lands for analysis
-                if card["name"] in ["Plains", "Island", "Swamp", "Mountain", "Forest", "Wastes"]:
-                    continue
-                    
-                record = {
-                    "deck_id": deck_index,
-                    "card_name": card["name"],
-                    "type_line": card.get("type_line", "Unknown"),
-                    "archetype": card.get("archetype", "auto"),
-                    "draft_number": card.get("draft_number", 0)
-                }
-                
-                # Add color information if available
-                if "colors" in card:
-                    record["colors"] = ",".join(card["colors"]) if card["colors"] else "Colorless"
-                    record["color_count"] = len(card["colors"])
-                else:
-                    record["colors"] = "Basic Land" if "Land" in card.get("type_line", "") else "Unknown"
-                    record["color_count"] = 0
-                
-                # Add other card attributes if available
-                for attr in ["cmc", "rarity", "score"]:
-                    if attr in card:
-                        record[attr] = card[attr]
-                
-                card_records.append(record)
+        # Add other card attributes if available
+        for attr in ["cmc", "rarity", "score"]:
+            if any(attr in card for card in cards):
+                data[attr] = [card.get(attr) for card in cards]
         
-        # Create DataFrame
-        df = pd.DataFrame(card_records)
+        # Names repeat across every deck, so store them as categoricals and group them
+        # below by category codes instead of hashing the strings each time; first-seen
+        # category order keeps count ties in the same order as grouping the strings
+        frame_data = dict(data)
+        for column in ["archetype", "card_name"]:
+            codes, uniques = pd.factorize(np.array(data[column], dtype=object))
+            frame_data[column] = pd.Categorical.from_codes(codes, uniques)
+        df = pd.DataFrame(frame_data)
+        
+        # Skip basic lands for analysis
+        analyzed = ~df["card_name"].isin(["Plains", "Island", "Swamp", "Mountain", "Forest", "Wastes"])
+        df = df[analyzed].reset_index(drop=True)
+        for column in ["archetype", "card_name"]:
+            df[column] = df[column].cat.remove_unused_categories()
+        
+        # Card types, parsed once per distinct type line and then broadcast back to the cards
+        type_codes, type_uniques = pd.factorize(df["type_line"], use_na_sentinel=False)
+        main_types = pd.Series(type_uniques).str.split("—", n=1).str[0].str.strip().fillna("Unknown")
+        df["main_type"] = main_types.to_numpy()[type_codes]
         
         # Analyze the data
+        if pl is not None:
+            # Polars' multi-threaded group-bys are faster than pandas for these counts,
+            # so aggregate a Polars frame built straight from the same column lists
+            cards_pl = pl.DataFrame(data, strict=False).filter(analyzed.to_numpy())
+            return df, _summarize_drafts_polars(cards_pl)
+        
         analysis = {}
         
-        # Card frequency
-        card_counts = df["card_name"].value_counts()
-        analysis["most_common_cards"] = card_counts.head(20).to_dict()
+        # Card frequency, counted over the card_name category codes (in first-seen order)
+        card_codes = df["card_name"].cat.codes.to_numpy().astype(np.int64)
+        card_names = np.asarray(df["card_name"].cat.categories, dtype=object)
+        card_counts = np.bincount(card_codes, minlength=len(card_names))
+        analysis["most_common_cards"] = _top_counts(card_counts, card_names, np.flatnonzero(card_counts), 20)
         
         # Color distribution
         if "colors" in df.columns:
@@ -671,7 +951,6 @@ class DraftSimulator:
             analysis["color_distribution"] = color_counts.to_dict()
         
         # Card type distribution
-        df["main_type"] = df["type_line"].apply(lambda x: x.split("—")[0].strip() if isinstance(x, str) else "Unknown")
         type_counts = df["main_type"].value_counts()
         analysis["type_distribution"] = type_counts.to_dict()
         
@@ -686,26 +965,116 @@ class DraftSimulator:
             analysis["rarity_distribution"] = rarity_counts.to_dict()
             
         # Archetype analysis (if we used multiple archetypes)
-        if "archetype" in df.columns and df["archetype"].nunique() > 1:
-            archetype_counts = df.groupby(["deck_id", "archetype"]).size().reset_index(name="count")
-            archetype_counts = archetype_counts["archetype"].value_counts()
-            analysis["archetype_distribution"] = archetype_counts.to_dict()
+        archetypes = df["archetype"].unique() if "archetype" in df.columns else []
+        if len(archetypes) > 1:
+            arch_codes = df["archetype"].cat.codes.to_numpy().astype(np.int64)
+            arch_names = np.asarray(df["archetype"].cat.categories, dtype=object)
+            
+            # Every card of a deck shares its archetype, so one row per deck is enough; the
+            # frame is built deck by deck, so each deck starts where deck_id changes
+            deck_starts = np.flatnonzero(np.diff(df["deck_id"].to_numpy(), prepend=-1))
+            deck_counts = np.bincount(arch_codes[deck_starts], minlength=len(arch_names))
+            analysis["archetype_distribution"] = _top_counts(deck_counts, arch_names, np.flatnonzero(deck_counts),
+                                                             len(arch_names))
+            
+            # Count cards for every archetype in one pass: number the (archetype, card) pairs in
+            # first-seen order so ties rank the same as counting each archetype on its own
+            # (a Counter per archetype is several times slower, even for small runs)
+            pair_codes, pairs = pd.factorize(arch_codes * len(card_names) + card_codes)
+            pair_counts = np.bincount(pair_codes)
+            pair_archetypes = pairs // len(card_names)
+            pair_names = card_names[pairs % len(card_names)]
+            
+            # Partition the pairs by archetype once (a stable sort keeps each archetype's pairs
+            # in first-seen order) instead of masking all of them for every archetype
+            pair_order = np.argsort(pair_archetypes, kind="stable")
+            arch_sizes = np.bincount(pair_archetypes, minlength=len(arch_names))
+            pairs_by_arch = dict(zip(arch_names.tolist(), np.split(pair_order, np.cumsum(arch_sizes)[:-1])))
+            
+            if "cmc" in df.columns:
+                mana_curves = _mana_curves_by_archetype(df)
             
             # Analyze each archetype separately
-            for archetype in df["archetype"].unique():
-                archetype_df = df[df["archetype"] == archetype]
-                
+            for archetype in archetypes:
                 # Most common cards in this archetype
-                arch_card_counts = archetype_df["card_name"].value_counts()
-                analysis[f"most_common_cards_{archetype}"] = arch_card_counts.head(10).to_dict()
+                analysis[f"most_common_cards_{archetype}"] = _top_counts(pair_counts, pair_names,
+                                                                         pairs_by_arch[archetype], 10)
                 
                 # Mana curve for this archetype
-                if "cmc" in archetype_df.columns:
-                    arch_mana_curve = archetype_df.groupby("cmc").size()
-                    analysis[f"mana_curve_{archetype}"] = arch_mana_curve.to_dict()
+                if "cmc" in df.columns:
+                    analysis[f"mana_curve_{archetype}"] = mana_curves.get(archetype, {})
         
         return df, analysis
 
+def _write_csv(df, path):
+    """Write a DataFrame to CSV without its index, using Arrow's multi-threaded writer when available"""
+    if pa is None:
+        df.to_csv(path, index=False)
+    else:
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
+def _write_parquet(df, path):
+    """Write a DataFrame to zstd-compressed Parquet without its index (requires pyarrow)"""
+    # Parquet dictionary-encodes repeated strings on its own, so store the categorical
+    # columns as plain strings and readers get the same column types as from the CSV
+    categorical = df.select_dtypes("category").columns
+    df = df.assign(**{column: df[column].astype(df[column].cat.categories.dtype) for column in categorical})
+    df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+
+def _write_json(data, path):
+    """Write data as indented UTF-8 JSON, encoding with orjson when available
+
+    orjson writes non-ASCII text as raw UTF-8 rather than \\u escapes, so readers must open the file as UTF-8.
+    """
+    if orjson is None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    else:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS |
+                                 orjson.OPT_SERIALIZE_NUMPY))
+
+# Archetype mix simulated by main, covering every available archetype;
+# comment out the ones you don't want to use
+ARCHETYPE_DISTRIBUTION = {
+    # Two-color pairs (Guilds)
+    # "WU": 0.04,  # Azorius
+    # "UB": 0.04,  # Dimir
+    # "BR": 0.04,  # Rakdos
+    # "RG": 0.04,  # Gruul
+    # "GW": 0.04,  # Selesnya
+    "WB": 0.04,  # Orzhov
+    "UR": 0.04,  # Izzet
+    "BG": 0.04,  # Golgari
+    "RW": 0.04,  # Boros
+    "GU": 0.04,  # Simic
+    
+    # Three-color combinations (Shards/Wedges)
+    # "WUB": 0.03,  # Esper
+    # "UBR": 0.03,  # Grixis
+    # "BRG": 0.03,  # Jund
+    # "RGW": 0.03,  # Naya
+    # "GWU": 0.03,  # Bant
+    "WBG": 0.03,  # Abzan
+    "URW": 0.03,  # Jeskai
+    "BGU": 0.03,  # Sultai
+    "RWB": 0.03,  # Mardu
+    "GUR": 0.03,  # Temur
+    
+    # Mono-color
+    "MONO_W": 0.03,  # Mono White
+    "MONO_U": 0.03,  # Mono Blue
+    "MONO_B": 0.03,  # Mono Black
+    "MONO_R": 0.03,  # Mono Red
+    "MONO_G": 0.03,  # Mono Green
+    
+    # Five-color
+    "5C": 0.02,  # Five Color
+    
+    # Auto-determine
+    # "auto": 0.05   # Automatically determine best colors
+}
+
 def main():
     # Set code for the set you want to analyze
     # Example: "ONE" for Phyrexia: All Will Be One
@@ -719,46 +1088,8 @@ def main():
     # Or use a distribution of archetypes
     # Example: simulate 25% WU, 25% UB, 50% RG decks
     # archetype_distribution = None
-    # Create a complete archetype distribution with all available archetypes
-    # Comment out the ones you don't want to use
-    archetype_distribution = {
-        # Two-color pairs (Guilds)
-        # "WU": 0.04,  # Azorius
-        # "UB": 0.04,  # Dimir
-        # "BR": 0.04,  # Rakdos
-        # "RG": 0.04,  # Gruul
-        # "GW": 0.04,  # Selesnya
-        "WB": 0.04,  # Orzhov
-        "UR": 0.04,  # Izzet
-        "BG": 0.04,  # Golgari
-        "RW": 0.04,  # Boros
-        "GU": 0.04,  # Simic
-        
-        # Three-color combinations (Shards/Wedges)
-        # "WUB": 0.03,  # Esper
-        # "UBR": 0.03,  # Grixis
-        # "BRG": 0.03,  # Jund
-        # "RGW": 0.03,  # Naya
-        # "GWU": 0.03,  # Bant
-        "WBG": 0.03,  # Abzan
-        "URW": 0.03,  # Jeskai
-        "BGU": 0.03,  # Sultai
-        "RWB": 0.03,  # Mardu
-        "GUR": 0.03,  # Temur
-        
-        # Mono-color
-        "MONO_W": 0.03,  # Mono White
-        "MONO_U": 0.03,  # Mono Blue
-        "MONO_B": 0.03,  # Mono Black
-        "MONO_R": 0.03,  # Mono Red
-        "MONO_G": 0.03,  # Mono Green
-        
-        # Five-color
-        "5C": 0.02,  # Five Color
-        
-        # Auto-determine
-        # "auto": 0.05   # Automatically determine best colors
-    }
+    # The default mix is ARCHETYPE_DISTRIBUTION, defined just above main
+    archetype_distribution = ARCHETYPE_DISTRIBUTION
     
     # Initialize simulator
     simulator = DraftSimulator(set_code=set_code)
@@ -780,18 +1111,26 @@ def main():
     print("Analyzing draft data...")
     df, analysis = simulator.analyze_drafts(decks)
     
-    # Save results
-    df.to_csv(f"draft_data_{set_code}.csv", index=False)
+    # Save results: the per-card data is written as compressed Parquet when pyarrow is
+    # installed, set save_csv to also (or otherwise) write it as CSV
+    save_csv = False
+    saved_files = []
+    if pa is not None:
+        _write_parquet(df, f"draft_data_{set_code}.parquet")
+        saved_files.append(f"draft_data_{set_code}.parquet")
+    if pa is None or save_csv:
+        _write_csv(df, f"draft_data_{set_code}.csv")
+        saved_files.append(f"draft_data_{set_code}.csv")
     
-    with open(f"draft_analysis_{set_code}.json", "w") as f:
-        json.dump(analysis, f, indent=2)
+    _write_json(analysis, f"draft_analysis_{set_code}.json")
+    saved_files.append(f"draft_analysis_{set_code}.json")
     
     # Print some interesting findings
     print("\n--- Draft Analysis Results ---")
     print(f"Analyzed {len(decks)} simulated sealed decks (23 non-land cards each)")
     
     print("\nTop 10 Most Drafted Cards:")
-    for card, count in list(analysis["most_common_cards"].items())[:10]:
+    for card, count in islice(analysis["most_common_cards"].items(), 10):
         print(f"- {card}: {count} occurrences")
     
     if "color_distribution" in analysis:
@@ -801,15 +1140,18 @@ def main():
     
     if "mana_curve" in analysis:
         print("\nAverage Mana Curve:")
-        for cmc, count in sorted(analysis["mana_curve"].items()):
-            print(f"- {cmc} CMC: {count/len(decks):.1f} cards per deck")
+        mana_curve = sorted(analysis["mana_curve"].items())
+        if mana_curve:
+            cmcs, counts = zip(*mana_curve)
+            per_deck = np.asarray(counts, dtype=np.float64) / len(decks)
+            print("\n".join(f"- {cmc} CMC: {average:.1f} cards per deck" for cmc, average in zip(cmcs, per_deck)))
             
     if "archetype_distribution" in analysis:
         print("\nArchetype Distribution:")
         for archetype, count in analysis["archetype_distribution"].items():
             print(f"- {archetype}: {count} decks")
     
-    print(f"\nFull results saved to draft_data_{set_code}.csv and draft_analysis_{set_code}.json")
+    print(f"\nFull results saved to {' and '.join(saved_files)}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -5,26 +5,202 @@ import json
 import os
 import numpy as np
 import argparse
+import multiprocessing
+import functools
+import glob
+import hashlib
+
+BASIC_LANDS = frozenset(['Plains', 'Island', 'Swamp', 'Mountain', 'Forest', 'Wastes'])
+WUBRG = ['W', 'U', 'B', 'R', 'G']
+
+# Low-cardinality string columns stored as categories, so group-bys work on integer codes
+CATEGORY_COLUMNS = ('archetype', 'rarity', 'colors', 'main_type', 'type_line')
+
+# Resolution of the saved charts; 150 DPI is plenty on screen and renders about 4x faster than 300
+DPI = int(os.environ.get('VIZ_DPI', '150'))
+
+# File format of the simple bar, line and pie charts; SVG/PDF skip rasterizing them entirely.
+# The dense multi-panel charts (archetype performance, deck statistics) are always PNG.
+FORMATS = ('png', 'svg', 'pdf')
+FORMAT = os.environ.get('VIZ_FORMAT', 'svg')
+
+# Bar colors for the single card colors (W, U, B, R, G, Colorless, Basic Land)
+CARD_COLORS = {
+    'W': '#F8F6D8',  # White
+    'U': '#0E68AB',  # Blue
+    'B': '#150B00',  # Black
+    'R': '#D3202A',  # Red
+    'G': '#00733E',  # Green
+    'Colorless': '#CBC5C0',  # Colorless
+    'Basic Land': '#DED5C0',  # Land
+    'multicolor': '#D8C091'   # Gold/multicolor
+}
+
+# Bar colors for the two-color pairs, and for every archetype code
+GUILD_COLORS = {
+    'WU': '#EAF2FA',  # Azorius
+    'UB': '#2A4E6E',  # Dimir
+    'BR': '#5E2B28',  # Rakdos
+    'RG': '#94703E',  # Gruul
+    'GW': '#A3C095',  # Selesnya
+    'WB': '#D1D1D1',  # Orzhov
+    'UR': '#7C4778',  # Izzet
+    'BG': '#3B584F',  # Golgari
+    'RW': '#E49977',  # Boros
+    'GU': '#229987'   # Simic
+}
+
+ARCHETYPE_COLORS = {
+    **GUILD_COLORS,
+    'auto': '#808080',  # Gray for auto
+    'WUB': '#7891C4',  # Esper
+    'UBR': '#531C54',  # Grixis
+    'BRG': '#5E3A22',  # Jund
+    'RGW': '#9A7E4F',  # Naya
+    'GWU': '#4D8B7C',  # Bant
+    'WBG': '#4D5645',  # Abzan
+    'URW': '#815487',  # Jeskai
+    'BGU': '#2D5D4B',  # Sultai
+    'RWB': '#8E534A',  # Mardu
+    'GUR': '#507660',  # Temur
+    'MONO_W': '#F9FAF5',  # Mono White
+    'MONO_U': '#0F75BB',  # Mono Blue
+    'MONO_B': '#2D2A26',  # Mono Black
+    'MONO_R': '#E24A33',  # Mono Red
+    'MONO_G': '#00844A',  # Mono Green
+    '5C': '#D8C091'  # Five Color
+}
+
+# Readable names for the archetype codes
+ARCHETYPE_NAMES = {
+    'WU': 'Azorius (WU)',
+    'UB': 'Dimir (UB)',
+    'BR': 'Rakdos (BR)',
+    'RG': 'Gruul (RG)',
+    'GW': 'Selesnya (GW)',
+    'WB': 'Orzhov (WB)',
+    'UR': 'Izzet (UR)',
+    'BG': 'Golgari (BG)',
+    'RW': 'Boros (RW)',
+    'GU': 'Simic (GU)',
+    'auto': 'Auto-Selected',
+    'WUB': 'Esper (WUB)',
+    'UBR': 'Grixis (UBR)',
+    'BRG': 'Jund (BRG)',
+    'RGW': 'Naya (RGW)',
+    'GWU': 'Bant (GWU)',
+    'WBG': 'Abzan (WBG)',
+    'URW': 'Jeskai (URW)',
+    'BGU': 'Sultai (BGU)',
+    'RWB': 'Mardu (RWB)',
+    'GUR': 'Temur (GUR)',
+    'MONO_W': 'Mono White',
+    'MONO_U': 'Mono Blue',
+    'MONO_B': 'Mono Black',
+    'MONO_R': 'Mono Red',
+    'MONO_G': 'Mono Green',
+    '5C': 'Five Color'
+}
+
+RARITY_ORDER = ('common', 'uncommon', 'rare', 'mythic')
+RARITY_COLORS = {
+    'common': 'black',
+    'uncommon': 'silver',
+    'rare': 'gold',
+    'mythic': 'orangered'
+}
 
 def load_data(set_code="ONE"):
-    """Load the CSV and JSON data files"""
+    """Load the card data (the newer of the Parquet and CSV files) and the JSON data file
+    
+    Files are read once per set code and process. Every call gets its own shallow copy of the
+    data frame, so columns a plot adds don't leak into later calls; the analysis dict is shared
+    and must not be modified.
+    """
+    df, analysis = _read_data(set_code)
+    return df.copy(deep=False), analysis
+
+@functools.lru_cache(maxsize=4)
+def _read_data(set_code):
+    """Read and prepare the card data and the JSON data file for load_data"""
+    parquet_path = f"draft_data_{set_code}.parquet"
     csv_path = f"draft_data_{set_code}.csv"
+    cache_path = f"draft_data_{set_code}.cache.parquet"
     json_path = f"draft_analysis_{set_code}.json"
     
-    if not os.path.exists(csv_path):
-        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+    if not os.path.exists(parquet_path) and not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Card data file not found: {parquet_path} or {csv_path}")
     
     if not os.path.exists(json_path):
         raise FileNotFoundError(f"JSON file not found: {json_path}")
     
-    # Load the data
-    df = pd.read_csv(csv_path)
+    # Load the data, from whichever of the Parquet and CSV files the simulator wrote last
+    write_cache = False
+    if os.path.exists(parquet_path) and (not os.path.exists(csv_path)
+                                         or os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)):
+        df = pd.read_parquet(parquet_path)
+    elif os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+        # Parsed copy of the CSV (with the derived columns) from a previous run
+        df = pd.read_parquet(cache_path)
+    else:
+        df = pd.read_csv(csv_path)
+        write_cache = True
+    
+    _add_derived_columns(df)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    if 'cmc' in df.columns:
+        # Mana values are small whole numbers, so float32 is exact and halves the bytes the CMC statistics read
+        df['cmc'] = df['cmc'].astype(np.float32)
+    
+    if write_cache:
+        try:
+            df.to_parquet(cache_path, compression='snappy', index=False)
+        except ImportError:
+            # No Parquet engine installed, so parse the CSV again next time
+            pass
     
-    with open(json_path, 'r') as f:
+    with open(json_path, 'r', encoding='utf-8') as f:
         analysis = json.load(f)
     
     return df, analysis
 
+def _add_derived_columns(df):
+    """Add the per-card columns the plots share (is_non_land, is_creature, is_sorcery, is_instant, main_type) if they are missing"""
+    if 'is_non_land' not in df.columns:
+        df['is_non_land'] = _non_land_mask(df)
+    missing = [col for col in ('is_creature', 'is_sorcery', 'is_instant', 'main_type') if col not in df.columns]
+    if missing:
+        # Parsed once per distinct type line and then broadcast back to the cards
+        type_codes, type_lines = pd.factorize(df['type_line'])
+        # Cards without a type line get code -1, which picks the trailing missing entry
+        type_lines = pd.Series([*type_lines, np.nan], dtype=object)
+        derived = {
+            'is_creature': type_lines.str.contains('Creature', case=False, na=False),
+            'is_sorcery': type_lines.str.contains('Sorcery', case=False, na=False),
+            'is_instant': type_lines.str.contains('Instant', case=False, na=False),
+            'main_type': type_lines.str.split('—', n=1).str[0].str.strip().fillna('Unknown'),
+        }
+        for col in missing:
+            df[col] = derived[col].to_numpy()[type_codes]
+
+def _non_land_mask(df):
+    """Return a boolean Series that is True for cards that are not lands"""
+    if 'is_non_land' in df.columns:
+        return df['is_non_land']
+    
+    # First exclude basic lands by name, then exclude other lands by type
+    return ~df['card_name'].isin(BASIC_LANDS) & ~df['type_line'].str.contains('Land', na=False, regex=False)
+
+def _savefig(fig, path):
+    """Save a figure at DPI, writing PNG files with fast (level 1) zlib compression"""
+    if path.endswith('.png'):
+        # Pillow's default level 6 compression costs more than drawing these charts, for files barely smaller
+        fig.savefig(path, dpi=DPI, pil_kwargs={'compress_level': 1})
+    else:
+        fig.savefig(path, dpi=DPI)
+
 def create_output_dir():
     """Create output directory for visualizations"""
     output_dir = "draft_visualizations"
@@ -51,32 +227,32 @@ def plot_mana_curve(analysis, output_dir):
     std_cmc = np.sqrt(np.average((x - mean_cmc)**2, weights=y))
     
     # Set up the figure
-    plt.figure(figsize=(12, 6))
+    fig, ax = plt.subplots(figsize=(12, 6))
     
-    plt.bar(x, y, color='skyblue', edgecolor='navy', alpha=0.7)
+    ax.bar(x, y, color='skyblue', edgecolor='navy', alpha=0.7)
     
     # Add a line showing the wieghted average (mean)
-    plt.axvline(x=mean_cmc, color='red', linestyle='--',
-                label=f'Weighted Mean = {mean_cmc:.2f}')
+    ax.axvline(x=mean_cmc, color='red', linestyle='--',
+               label=f'Weighted Mean = {mean_cmc:.2f}')
     
     # Add labels and title
-    plt.xlabel('Mana Value')
-    plt.ylabel('Average Cards per Deck')
-    plt.title(f'Average Mana Curve (σ = {std_cmc:.2f})')  # Fix f-string
+    ax.set_xlabel('Mana Value')
+    ax.set_ylabel('Average Cards per Deck')
+    ax.set_title(f'Average Mana Curve (σ = {std_cmc:.2f})')  # Fix f-string
     
     # Adjust x axis to be integers
-    plt.xticks(x)
+    ax.set_xticks(x)
     
     # Add grid for readability
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.legend()
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.legend()
     
     # Save the figure
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/mana_curve.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _savefig(fig, f"{output_dir}/mana_curve.{FORMAT}")
+    plt.close(fig)
     
-    print(f"Mana curve visualization saved to {output_dir}/mana_curve.png")
+    print(f"Mana curve visualization saved to {output_dir}/mana_curve.{FORMAT}")
 
 def plot_color_distribution(analysis, output_dir):
     """Plot the color distribution from the draft analysis with NumPy for calculations"""
@@ -85,7 +261,7 @@ def plot_color_distribution(analysis, output_dir):
         return
     
     # Set up the figure
-    plt.figure(figsize=(12, 6))
+    fig, ax = plt.subplots(figsize=(12, 6))
     
     # Create a DataFrame from the color distribution
     colors_df = pd.DataFrame({
@@ -101,18 +277,6 @@ def plot_color_distribution(analysis, output_dir):
     total = np.sum(counts)
     percentages = 100 * counts / total
     
-    # Get color palettes for MTG colors
-    color_map = {
-        'W': '#F8F6D8',  # White
-        'U': '#0E68AB',  # Blue
-        'B': '#150B00',  # Black
-        'R': '#D3202A',  # Red
-        'G': '#00733E',  # Green
-        'Colorless': '#CBC5C0',  # Colorless
-        'Basic Land': '#DED5C0',  # Land
-        'multicolor': '#D8C091'   # Gold/multicolor
-    }
-    
     # If we have combined strings like "W,U", use a default color
     bar_colors = []
     for color_name in colors_df['Color']:
@@ -121,32 +285,32 @@ def plot_color_distribution(analysis, output_dir):
             bar_colors.append('#D8C091')  # Gold for multicolor
         else:
             # Look up the color in our map, default to gray
-            bar_colors.append(color_map.get(color_name, '#808080'))
+            bar_colors.append(CARD_COLORS.get(color_name, '#808080'))
     
     # Create the bar chart
-    bars = plt.bar(colors_df['Color'], colors_df['Count'], color=bar_colors, edgecolor='black')
+    bars = ax.bar(colors_df['Color'], colors_df['Count'], color=bar_colors, edgecolor='black')
     
     # Add labels and title
-    plt.xlabel('Color')
-    plt.ylabel('Total Cards')
-    plt.title('Color Distribution Across All Simulated Decks')
+    ax.set_xlabel('Color')
+    ax.set_ylabel('Total Cards')
+    ax.set_title('Color Distribution Across All Simulated Decks')
     
     # Add total number and percentage annotations
     for i, (v, p) in enumerate(zip(counts, percentages)):
-        plt.text(i, v + 0.5, f"{v} ({p:.1f}%)", ha='center')
+        ax.text(i, v + 0.5, f"{v} ({p:.1f}%)", ha='center')
     
     # Rotate x-axis labels for readability
-    plt.xticks(rotation=45, ha='right')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
     
     # Add grid for readability
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
     # Save the figure
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/color_distribution.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _savefig(fig, f"{output_dir}/color_distribution.{FORMAT}")
+    plt.close(fig)
     
-    print(f"Color distribution visualization saved to {output_dir}/color_distribution.png")
+    print(f"Color distribution visualization saved to {output_dir}/color_distribution.{FORMAT}")
 
 def plot_card_frequency(analysis, output_dir, top_n=20):
     """Plot the most frequent cards from the draft analysis"""
@@ -155,7 +319,7 @@ def plot_card_frequency(analysis, output_dir, top_n=20):
         return
     
     # Set up the figure
-    plt.figure(figsize=(14, 8))
+    fig, ax = plt.subplots(figsize=(14, 8))
     
     # Create a DataFrame from the card frequency
     cards_df = pd.DataFrame({
@@ -170,26 +334,26 @@ def plot_card_frequency(analysis, output_dir, top_n=20):
     cards_df = cards_df.iloc[::-1]
     
     # Create the horizontal bar chart
-    plt.barh(cards_df['Card'], cards_df['Count'], color='lightblue', edgecolor='navy', alpha=0.8)
+    ax.barh(cards_df['Card'], cards_df['Count'], color='lightblue', edgecolor='navy', alpha=0.8)
     
     # Add labels and title
-    plt.xlabel('Count')
-    plt.ylabel('Card Name')
-    plt.title(f'Top {top_n} Most Frequently Drafted Cards')
+    ax.set_xlabel('Count')
+    ax.set_ylabel('Card Name')
+    ax.set_title(f'Top {top_n} Most Frequently Drafted Cards')
     
     # Add total number annotations
     for i, v in enumerate(cards_df['Count']):
-        plt.text(v + 0.5, i, str(v), va='center')
+        ax.text(v + 0.5, i, str(v), va='center')
     
     # Add grid for readability
-    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
     
     # Save the figure
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/card_frequency_top_{top_n}.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _savefig(fig, f"{output_dir}/card_frequency_top_{top_n}.{FORMAT}")
+    plt.close(fig)
     
-    print(f"Card frequency visualization saved to {output_dir}/card_frequency_top_{top_n}.png")
+    print(f"Card frequency visualization saved to {output_dir}/card_frequency_top_{top_n}.{FORMAT}")
 
 def plot_type_distribution(analysis, output_dir):
     """Plot the card type distribution from the draft analysis"""
@@ -198,7 +362,7 @@ def plot_type_distribution(analysis, output_dir):
         return
     
     # Set up the figure
-    plt.figure(figsize=(12, 8))
+    fig, ax = plt.subplots(figsize=(12, 8))
     
     # Create a DataFrame from the type distribution
     types_df = pd.DataFrame({
@@ -210,26 +374,26 @@ def plot_type_distribution(analysis, output_dir):
     types_df = types_df.sort_values('Count', ascending=False)
     
     # Create the bar chart - Fix for seaborn deprecation warning
-    sns.barplot(x='Count', y='Type', data=types_df, hue='Type', palette='viridis', legend=False)
+    sns.barplot(x='Count', y='Type', data=types_df, hue='Type', palette='viridis', legend=False, ax=ax)
     
     # Add labels and title
-    plt.xlabel('Count')
-    plt.ylabel('Card Type')
-    plt.title('Card Type Distribution Across All Simulated Decks')
+    ax.set_xlabel('Count')
+    ax.set_ylabel('Card Type')
+    ax.set_title('Card Type Distribution Across All Simulated Decks')
     
     # Add total number annotations
     for i, v in enumerate(types_df['Count']):
-        plt.text(v + 0.5, i, str(v), va='center')
+        ax.text(v + 0.5, i, str(v), va='center')
     
     # Add grid for readability
-    plt.grid(axis='x', linestyle='--', alpha=0.7)
+    ax.grid(axis='x', linestyle='--', alpha=0.7)
     
     # Save the figure
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/type_distribution.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _savefig(fig, f"{output_dir}/type_distribution.{FORMAT}")
+    plt.close(fig)
     
-    print(f"Type distribution visualization saved to {output_dir}/type_distribution.png")
+    print(f"Type distribution visualization saved to {output_dir}/type_distribution.{FORMAT}")
 
 def plot_rarity_distribution(analysis, output_dir):
     """Plot the rarity distribution from the draft analysis using NumPy for calculations"""
@@ -238,7 +402,7 @@ def plot_rarity_distribution(analysis, output_dir):
         return
     
     # Set up the figure
-    plt.figure(figsize=(10, 6))
+    fig, ax = plt.subplots(figsize=(10, 6))
     
     # Create a DataFrame from the rarity distribution
     rarity_df = pd.DataFrame({
@@ -246,10 +410,10 @@ def plot_rarity_distribution(analysis, output_dir):
         'Count': list(analysis["rarity_distribution"].values())
     })
     
-    # Sort by traditional rarity order
-    rarity_order = ['common', 'uncommon', 'rare', 'mythic']
-    rarity_df['Order'] = rarity_df['Rarity'].apply(lambda x: rarity_order.index(x) if x in rarity_order else 999)
-    rarity_df = rarity_df.sort_values('Order')
+    # Sort by traditional rarity order, with any other rarities after the known ones
+    extra_rarities = sorted(set(rarity_df['Rarity']) - set(RARITY_ORDER))
+    rarity_df['Rarity'] = pd.Categorical(rarity_df['Rarity'], categories=[*RARITY_ORDER, *extra_rarities], ordered=True)
+    rarity_df = rarity_df.sort_values('Rarity')
 
     # Convert to numpy array for calculations
     counts = np.array(rarity_df['Count'])
@@ -257,135 +421,101 @@ def plot_rarity_distribution(analysis, output_dir):
     percentages = 100 * counts / total
     
     # Define colors for each rarity
-    rarity_colors = {
-        'common': 'black',
-        'uncommon': 'silver',
-        'rare': 'gold',
-        'mythic': 'orangered'
-    }
-    colors = [rarity_colors.get(r, 'gray') for r in rarity_df['Rarity']]
+    colors = [RARITY_COLORS.get(r, 'gray') for r in rarity_df['Rarity']]
     
     # Create the pie chart with percentages
-    plt.pie(counts, labels=rarity_df['Rarity'], autopct='%1.1f%%', 
-            colors=colors, startangle=90, shadow=True)
+    ax.pie(counts, labels=rarity_df['Rarity'], autopct='%1.1f%%', 
+           colors=colors, startangle=90, shadow=True)
     
     # Add title with total card count
-    plt.title(f'Rarity Distribution Across All Simulated Decks ({total} cards)')
+    ax.set_title(f'Rarity Distribution Across All Simulated Decks ({total} cards)')
 
     # Add a table showing exact counts and percentages
     cell_text = [[f"{c} ({p:.1f}%)" for c, p in zip(counts, percentages)]]
-    plt.table(cellText=cell_text,
-              rowLabels=['Count (%)'],
-              colLabels=rarity_df['Rarity'],
-              loc='bottom',
-              bbox=[0, -0.3, 1, 0.2])
+    ax.table(cellText=cell_text,
+             rowLabels=['Count (%)'],
+             colLabels=rarity_df['Rarity'],
+             loc='bottom',
+             bbox=[0, -0.3, 1, 0.2])
     
     # Save the figure
-    plt.subplots_adjust(bottom=0.3)
-    plt.savefig(f"{output_dir}/rarity_distribution.png", dpi=300)
-    plt.close()
+    fig.subplots_adjust(bottom=0.3)
+    _savefig(fig, f"{output_dir}/rarity_distribution.{FORMAT}")
+    plt.close(fig)
     
-    print(f"Rarity distribution visualization saved to {output_dir}/rarity_distribution.png")
+    print(f"Rarity distribution visualization saved to {output_dir}/rarity_distribution.{FORMAT}")
 
 def plot_deck_color_pairs(df, output_dir):
     """Plot frequency of two-color combinations used in decks"""
-    # This requires some calculation since we need to analyze each deck
-    
-    # Group by deck_id
-    deck_groups = df.groupby('deck_id')
-    
-    # Track color pairs for each deck
-    color_pairs = []
-    
-    # Loop through each deck
-    for deck_id, deck_data in deck_groups:
-        # Get non-land cards to determine deck colors
-        # First exclude basic lands by name
-        non_basic_lands = ~deck_data['card_name'].isin(['Plains', 'Island', 'Swamp', 'Mountain', 'Forest', 'Wastes'])
-        # Then exclude other lands by type
-        non_lands = deck_data[non_basic_lands & ~deck_data['type_line'].str.contains('Land', na=False)]
-        
-        # Count cards of each color in the deck (excluding lands)
-        if 'colors' in non_lands.columns:
-            # Skip if colors column has NaN or is not properly formatted
-            if non_lands['colors'].isna().all():
-                continue
-                
-            # Split comma-separated colors and count each color
-            color_counts = {}
-            
-            for _, row in non_lands.iterrows():
-                if pd.isna(row['colors']) or row['colors'] == 'Colorless' or row['colors'] == 'Basic Land':
-                    continue
-                    
-                colors = row['colors'].split(',')
-                for color in colors:
-                    color = color.strip()
-                    if color in ['W', 'U', 'B', 'R', 'G']:
-                        color_counts[color] = color_counts.get(color, 0) + 1
-            
-            # Find the top two colors
-            if len(color_counts) >= 2:
-                top_colors = sorted(color_counts.items(), key=lambda x: x[1], reverse=True)[:2]
-                top_color_pair = ''.join(sorted([c[0] for c in top_colors]))
-                color_pairs.append(top_color_pair)
+    # Get non-land cards to determine deck colors
+    non_lands = df[_non_land_mask(df)]
+    
+    # Number of decks for each color pair, indexed by first * 5 + second WUBRG position
+    pair_freq = np.zeros(len(WUBRG) ** 2, dtype=np.int64)
+    
+    if 'colors' in non_lands.columns and len(non_lands):
+        # One column per WUBRG color; 'Colorless' and 'Basic Land' columns are dropped by the reindex
+        dummies = non_lands['colors'].str.get_dummies(sep=',').reindex(columns=WUBRG, fill_value=0).to_numpy()
+        deck_codes, deck_ids = pd.factorize(non_lands['deck_id'])
+        
+        # Count cards of each color in each deck, and note the first card that shows each color
+        n = len(dummies)
+        counts = np.zeros((len(deck_ids), len(WUBRG)), dtype=np.int64)
+        first_seen = np.full((len(deck_ids), len(WUBRG)), n * len(WUBRG), dtype=np.int64)
+        for color in range(len(WUBRG)):
+            rows = np.flatnonzero(dummies[:, color])
+            counts[:, color] = np.bincount(deck_codes[rows], minlength=len(deck_ids))
+            decks, first = np.unique(deck_codes[rows], return_index=True)
+            first_seen[decks, color] = rows[first] * len(WUBRG) + color
+        
+        # Rank tied colors by the first card that shows them, as the per-deck loop used to
+        rank = counts * (n + 1) * len(WUBRG) - first_seen
+        
+        # Find the top two colors of every deck with at least two colors
+        two_color = (counts > 0).sum(axis=1) >= 2
+        top_two = np.sort(np.argpartition(-rank[two_color], 1, axis=1)[:, :2], axis=1)
+        pair_freq = np.bincount(top_two[:, 0] * len(WUBRG) + top_two[:, 1], minlength=len(WUBRG) ** 2)
     
     # Count the frequency of each color pair
-    if color_pairs:
-        pair_counts = {}
-        for pair in color_pairs:
-            pair_counts[pair] = pair_counts.get(pair, 0) + 1
+    if pair_freq.any():
+        pair_codes = np.flatnonzero(pair_freq)
         
-        # Create DataFrame for visualization
+        # Create DataFrame for visualization, naming each pair by its letters in alphabetical order
         pair_df = pd.DataFrame({
-            'Color Pair': list(pair_counts.keys()),
-            'Count': list(pair_counts.values())
+            'Color Pair': [''.join(sorted(WUBRG[code // len(WUBRG)] + WUBRG[code % len(WUBRG)])) for code in pair_codes],
+            'Count': pair_freq[pair_codes]
         })
         
         # Sort by count in descending order
         pair_df = pair_df.sort_values('Count', ascending=False)
         
         # Set up the figure
-        plt.figure(figsize=(12, 8))
-        
-        # Define color mapping for the pairs
-        color_mapping = {
-            'WU': '#EAF2FA',  # Azorius
-            'UB': '#2A4E6E',  # Dimir
-            'BR': '#5E2B28',  # Rakdos
-            'RG': '#94703E',  # Gruul
-            'GW': '#A3C095',  # Selesnya
-            'WB': '#D1D1D1',  # Orzhov
-            'UR': '#7C4778',  # Izzet
-            'BG': '#3B584F',  # Golgari
-            'RW': '#E49977',  # Boros
-            'GU': '#229987'   # Simic
-        }
+        fig, ax = plt.subplots(figsize=(12, 8))
         
         # Get colors for the bars
-        bar_colors = [color_mapping.get(pair, '#808080') for pair in pair_df['Color Pair']]
+        bar_colors = [GUILD_COLORS.get(pair, '#808080') for pair in pair_df['Color Pair']]
         
         # Plot
-        plt.bar(pair_df['Color Pair'], pair_df['Count'], color=bar_colors, edgecolor='black')
+        ax.bar(pair_df['Color Pair'], pair_df['Count'], color=bar_colors, edgecolor='black')
         
         # Add labels and title
-        plt.xlabel('Color Pair')
-        plt.ylabel('Number of Decks')
-        plt.title('Frequency of Two-Color Combinations in Simulated Decks')
+        ax.set_xlabel('Color Pair')
+        ax.set_ylabel('Number of Decks')
+        ax.set_title('Frequency of Two-Color Combinations in Simulated Decks')
         
         # Add grid for readability
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
         
         # Add count annotations
         for i, v in enumerate(pair_df['Count']):
-            plt.text(i, v + 0.5, str(v), ha='center')
+            ax.text(i, v + 0.5, str(v), ha='center')
         
         # Save the figure
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/color_pair_distribution.png", dpi=300)
-        plt.close()
+        fig.tight_layout()
+        _savefig(fig, f"{output_dir}/color_pair_distribution.{FORMAT}")
+        plt.close(fig)
         
-        print(f"Color pair distribution visualization saved to {output_dir}/color_pair_distribution.png")
+        print(f"Color pair distribution visualization saved to {output_dir}/color_pair_distribution.{FORMAT}")
     else:
         print("Couldn't determine deck color pairs from the data")
 
@@ -396,7 +526,7 @@ def plot_archetype_distribution(analysis, output_dir):
         return
     
     # Set up the figure
-    plt.figure(figsize=(14, 8))
+    fig, ax = plt.subplots(figsize=(14, 8))
     
     # Create a DataFrame from the archetype distribution
     arch_df = pd.DataFrame({
@@ -407,64 +537,33 @@ def plot_archetype_distribution(analysis, output_dir):
     # Sort by count in descending order
     arch_df = arch_df.sort_values('Count', ascending=False)
     
-    # Define color mapping for guild names
-    archetype_color_mapping = {
-        'WU': '#EAF2FA',  # Azorius
-        'UB': '#2A4E6E',  # Dimir
-        'BR': '#5E2B28',  # Rakdos
-        'RG': '#94703E',  # Gruul
-        'GW': '#A3C095',  # Selesnya
-        'WB': '#D1D1D1',  # Orzhov
-        'UR': '#7C4778',  # Izzet
-        'BG': '#3B584F',  # Golgari
-        'RW': '#E49977',  # Boros
-        'GU': '#229987',  # Simic
-        'auto': '#808080',  # Gray for auto
-        'WUB': '#7891C4',  # Esper
-        'UBR': '#531C54',  # Grixis
-        'BRG': '#5E3A22',  # Jund
-        'RGW': '#9A7E4F',  # Naya
-        'GWU': '#4D8B7C',  # Bant
-        'WBG': '#4D5645',  # Abzan
-        'URW': '#815487',  # Jeskai
-        'BGU': '#2D5D4B',  # Sultai
-        'RWB': '#8E534A',  # Mardu
-        'GUR': '#507660',  # Temur
-        'MONO_W': '#F9FAF5',  # Mono White
-        'MONO_U': '#0F75BB',  # Mono Blue
-        'MONO_B': '#2D2A26',  # Mono Black
-        'MONO_R': '#E24A33',  # Mono Red
-        'MONO_G': '#00844A',  # Mono Green
-        '5C': '#D8C091'  # Five Color
-    }
-    
     # Get colors for the bars
-    bar_colors = [archetype_color_mapping.get(arch, '#808080') for arch in arch_df['Archetype']]
+    bar_colors = [ARCHETYPE_COLORS.get(arch, '#808080') for arch in arch_df['Archetype']]
     
     # Create the bar chart
-    plt.bar(arch_df['Archetype'], arch_df['Count'], color=bar_colors, edgecolor='black')
+    ax.bar(arch_df['Archetype'], arch_df['Count'], color=bar_colors, edgecolor='black')
     
     # Add labels and title
-    plt.xlabel('Archetype')
-    plt.ylabel('Number of Decks')
-    plt.title('Distribution of Deck Archetypes')
+    ax.set_xlabel('Archetype')
+    ax.set_ylabel('Number of Decks')
+    ax.set_title('Distribution of Deck Archetypes')
     
     # Rotate x-axis labels for readability
-    plt.xticks(rotation=45, ha='right')
+    plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
     
     # Add grid for readability
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
     # Add count annotations
     for i, v in enumerate(arch_df['Count']):
-        plt.text(i, v + 0.5, str(v), ha='center')
+        ax.text(i, v + 0.5, str(v), ha='center')
     
     # Save the figure
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/archetype_distribution.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _savefig(fig, f"{output_dir}/archetype_distribution.{FORMAT}")
+    plt.close(fig)
     
-    print(f"Archetype distribution visualization saved to {output_dir}/archetype_distribution.png")
+    print(f"Archetype distribution visualization saved to {output_dir}/archetype_distribution.{FORMAT}")
 
 def plot_archetype_performance(df, output_dir):
     """Plot performance metrics by archetype"""
@@ -477,21 +576,21 @@ def plot_archetype_performance(df, output_dir):
         print("Only one archetype found, skipping archetype performance comparison")
         return
     
-    # Create a figure
-    plt.figure(figsize=(15, 10))
-    
     # Create a grid of subplots
     fig, axes = plt.subplots(nrows=2, ncols=2, figsize=(16, 14))
     
     # 1. Average CMC by archetype
     if 'cmc' in df.columns:
         # Calculate average CMC by archetype
-        avg_cmc = df.groupby('archetype')['cmc'].mean().reset_index()
+        avg_cmc = df.groupby('archetype', observed=True)['cmc'].mean().reset_index()
         avg_cmc = avg_cmc.sort_values('cmc')
         
         # Plot - Fix for seaborn deprecation warning
+        # (order keeps the sorted bars; a categorical column would otherwise plot in category order,
+        # and dodge=False keeps full-width bars, which seaborn would otherwise split per categorical hue level)
         ax = axes[0, 0]
-        sns.barplot(x='archetype', y='cmc', data=avg_cmc, ax=ax, hue='archetype', legend=False)
+        sns.barplot(x='archetype', y='cmc', data=avg_cmc, ax=ax, hue='archetype', legend=False,
+                    order=avg_cmc['archetype'], dodge=False)
         ax.set_title('Average Mana Value by Archetype')
         ax.set_xlabel('Archetype')
         ax.set_ylabel('Average Mana Value')
@@ -499,19 +598,20 @@ def plot_archetype_performance(df, output_dir):
         ax.grid(axis='y', linestyle='--', alpha=0.7)
     
     # 2. Creature Count by archetype
-    # Create a creature count column
-    df['is_creature'] = df['type_line'].str.contains('Creature', case=False, na=False)
+    # Make sure the creature flag column exists (load_data already adds it)
+    _add_derived_columns(df)
     
     # Group by deck_id and archetype, count creatures
-    creature_counts = df[df['is_creature']].groupby(['deck_id', 'archetype']).size().reset_index(name='creature_count')
+    creature_counts = df[df['is_creature']].groupby(['deck_id', 'archetype'], observed=True).size().reset_index(name='creature_count')
     
     # Average creature count by archetype
-    avg_creatures = creature_counts.groupby('archetype')['creature_count'].mean().reset_index()
+    avg_creatures = creature_counts.groupby('archetype', observed=True)['creature_count'].mean().reset_index()
     avg_creatures = avg_creatures.sort_values('creature_count', ascending=False)
     
     # Plot - Fix for seaborn deprecation warning
     ax = axes[0, 1]
-    sns.barplot(x='archetype', y='creature_count', data=avg_creatures, ax=ax, hue='archetype', legend=False)
+    sns.barplot(x='archetype', y='creature_count', data=avg_creatures, ax=ax, hue='archetype', legend=False,
+                order=avg_creatures['archetype'], dodge=False)
     ax.set_title('Average Creature Count by Archetype')
     ax.set_xlabel('Archetype')
     ax.set_ylabel('Average Creatures per Deck')
@@ -520,34 +620,20 @@ def plot_archetype_performance(df, output_dir):
     
     # 3. Color distribution within each archetype
     # Get non-land cards
-    # First exclude basic lands by name
-    non_basic_lands = ~df['card_name'].isin(['Plains', 'Island', 'Swamp', 'Mountain', 'Forest', 'Wastes'])
-    # Then exclude other lands by type
-    non_lands = df[non_basic_lands & ~df['type_line'].str.contains('Land', na=False)]
+    non_lands = df[_non_land_mask(df)]
     
     # Count unique colors in each archetype
     if 'colors' in non_lands.columns:
         # Prepare data: expand color string into separate rows
-        color_data = []
-        for _, row in non_lands.iterrows():
-            if pd.isna(row['colors']) or row['colors'] in ['Colorless', 'Basic Land']:
-                continue
-                
-            colors = row['colors'].split(',')
-            for color in colors:
-                color = color.strip()
-                if color in ['W', 'U', 'B', 'R', 'G']:
-                    color_data.append({
-                        'archetype': row['archetype'],
-                        'color': color
-                    })
-        
-        if color_data:
-            # Create DataFrame from expanded data
-            color_df = pd.DataFrame(color_data)
-            
+        color_df = non_lands[['archetype', 'colors']].dropna(subset=['colors'])
+        color_df = color_df[~color_df['colors'].isin(['Colorless', 'Basic Land'])]
+        color_df = color_df.assign(color=color_df['colors'].str.split(',')).explode('color')
+        color_df['color'] = color_df['color'].str.strip()
+        color_df = color_df[color_df['color'].isin(WUBRG)]
+        
+        if len(color_df):
             # Count colors in each archetype
-            color_counts = color_df.groupby(['archetype', 'color']).size().reset_index(name='count')
+            color_counts = color_df.groupby(['archetype', 'color'], observed=True).size().reset_index(name='count')
             
             # Plot
             ax = axes[1, 0]
@@ -559,15 +645,14 @@ def plot_archetype_performance(df, output_dir):
             ax.legend(title='Archetype', bbox_to_anchor=(1.05, 1), loc='upper left')
     
     # 4. Card Type distribution by archetype
-    # Extract main type from type_line
-    df['main_type'] = df['type_line'].apply(lambda x: x.split('—')[0].strip() if isinstance(x, str) else 'Unknown')
-    
     # Count card types in each archetype
-    type_counts = df.groupby(['archetype', 'main_type']).size().reset_index(name='count')
+    type_counts = df.groupby(['archetype', 'main_type'], observed=True).size().reset_index(name='count')
     
     # Filter to include only common card types
-    common_types = type_counts.groupby('main_type')['count'].sum().nlargest(5).index
+    common_types = type_counts.groupby('main_type', observed=True)['count'].sum().nlargest(5).index
     type_counts = type_counts[type_counts['main_type'].isin(common_types)]
+    # Drop the filtered-out types from the categories so they don't get empty slots on the x axis
+    type_counts = type_counts.assign(main_type=type_counts['main_type'].astype('category').cat.remove_unused_categories())
     
     # Plot
     ax = axes[1, 1]
@@ -580,9 +665,9 @@ def plot_archetype_performance(df, output_dir):
     ax.legend(title='Archetype', bbox_to_anchor=(1.05, 1), loc='upper left')
     
     # Adjust layout and save
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/archetype_performance.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _savefig(fig, f"{output_dir}/archetype_performance.png")
+    plt.close(fig)
     
     print(f"Archetype performance visualization saved to {output_dir}/archetype_performance.png")
 
@@ -603,9 +688,6 @@ def plot_archetype_top_cards(analysis, output_dir):
     if not os.path.exists(arch_dir):
         os.makedirs(arch_dir)
     
-    # Create a figure to compare top cards across archetypes
-    plt.figure(figsize=(16, 10))
-    
     # For each archetype, plot its top cards
     for archetype in archetypes:
         key = f"most_common_cards_{archetype}"
@@ -626,28 +708,28 @@ def plot_archetype_top_cards(analysis, output_dir):
         top_cards = top_cards.iloc[::-1]
         
         # Set up figure for this archetype
-        plt.figure(figsize=(12, 8))
+        fig, ax = plt.subplots(figsize=(12, 8))
         
         # Plot horizontal bar chart
-        plt.barh(top_cards['Card'], top_cards['Count'])
+        ax.barh(top_cards['Card'], top_cards['Count'])
         
         # Add labels and title
-        plt.xlabel('Count')
-        plt.ylabel('Card Name')
+        ax.set_xlabel('Count')
+        ax.set_ylabel('Card Name')
         archetype_name = get_archetype_name(archetype)
-        plt.title(f'Top 10 Cards in {archetype_name} Decks')
+        ax.set_title(f'Top 10 Cards in {archetype_name} Decks')
         
         # Add count annotations
         for i, v in enumerate(top_cards['Count']):
-            plt.text(v + 0.1, i, str(v), va='center')
+            ax.text(v + 0.1, i, str(v), va='center')
         
         # Add grid
-        plt.grid(axis='x', linestyle='--', alpha=0.7)
+        ax.grid(axis='x', linestyle='--', alpha=0.7)
         
         # Save individual archetype chart
-        plt.tight_layout()
-        plt.savefig(f"{arch_dir}/top_cards_{archetype}.png", dpi=300)
-        plt.close()
+        fig.tight_layout()
+        _savefig(fig, f"{arch_dir}/top_cards_{archetype}.{FORMAT}")
+        plt.close(fig)
         
     # Create a combined visualization showing top 5 cards from each archetype
     # Set up grid of subplots based on number of archetypes
@@ -692,44 +774,15 @@ def plot_archetype_top_cards(analysis, output_dir):
     for j in range(i+1, len(axes)):
         fig.delaxes(axes[j])
     
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/archetype_top_cards_comparison.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _savefig(fig, f"{output_dir}/archetype_top_cards_comparison.{FORMAT}")
+    plt.close(fig)
     
     print(f"Archetype top cards visualizations saved to {arch_dir} and comparison saved to {output_dir}")
 
 def get_archetype_name(code):
     """Convert archetype code to readable name"""
-    archetype_names = {
-        'WU': 'Azorius (WU)',
-        'UB': 'Dimir (UB)',
-        'BR': 'Rakdos (BR)',
-        'RG': 'Gruul (RG)',
-        'GW': 'Selesnya (GW)',
-        'WB': 'Orzhov (WB)',
-        'UR': 'Izzet (UR)',
-        'BG': 'Golgari (BG)',
-        'RW': 'Boros (RW)',
-        'GU': 'Simic (GU)',
-        'auto': 'Auto-Selected',
-        'WUB': 'Esper (WUB)',
-        'UBR': 'Grixis (UBR)',
-        'BRG': 'Jund (BRG)',
-        'RGW': 'Naya (RGW)',
-        'GWU': 'Bant (GWU)',
-        'WBG': 'Abzan (WBG)',
-        'URW': 'Jeskai (URW)',
-        'BGU': 'Sultai (BGU)',
-        'RWB': 'Mardu (RWB)',
-        'GUR': 'Temur (GUR)',
-        'MONO_W': 'Mono White',
-        'MONO_U': 'Mono Blue',
-        'MONO_B': 'Mono Black',
-        'MONO_R': 'Mono Red',
-        'MONO_G': 'Mono Green',
-        '5C': 'Five Color'
-    }
-    return archetype_names.get(code, code)
+    return ARCHETYPE_NAMES.get(code, code)
 
 def plot_archetype_mana_curves(analysis, output_dir):
     """Plot mana curves for different archetypes"""
@@ -759,30 +812,30 @@ def plot_archetype_mana_curves(analysis, output_dir):
         mana_values = sorted([(float(k), v) for k, v in analysis[key].items()])
         
         # Set up figure for this archetype
-        plt.figure(figsize=(10, 6))
+        fig, ax = plt.subplots(figsize=(10, 6))
         
         # Plot bar chart for this archetype
         x = [pair[0] for pair in mana_values]
         y = [pair[1]/100 for pair in mana_values]  # Normalize by approximate deck count
         
-        plt.bar(x, y, alpha=0.7)
+        ax.bar(x, y, alpha=0.7)
         
         # Add labels and title
-        plt.xlabel('Mana Value')
-        plt.ylabel('Average Cards per Deck')
+        ax.set_xlabel('Mana Value')
+        ax.set_ylabel('Average Cards per Deck')
         archetype_name = get_archetype_name(archetype)
-        plt.title(f'Mana Curve for {archetype_name} Decks')
+        ax.set_title(f'Mana Curve for {archetype_name} Decks')
         
         # Adjust x axis
-        plt.xticks(x)
+        ax.set_xticks(x)
         
         # Add grid
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
         
         # Save individual archetype chart
-        plt.tight_layout()
-        plt.savefig(f"{curves_dir}/mana_curve_{archetype}.png", dpi=300)
-        plt.close()
+        fig.tight_layout()
+        _savefig(fig, f"{curves_dir}/mana_curve_{archetype}.{FORMAT}")
+        plt.close(fig)
         
         # Add to combined data
         for cmc, count in mana_values:
@@ -797,171 +850,220 @@ def plot_archetype_mana_curves(analysis, output_dir):
         combined_df = pd.DataFrame(combined_data)
         
         # Set up figure
-        plt.figure(figsize=(14, 8))
+        fig, ax = plt.subplots(figsize=(14, 8))
         
         # Plot lines for each archetype
         for archetype in archetypes:
             arch_data = combined_df[combined_df['archetype'] == archetype]
             if not arch_data.empty:
-                plt.plot(arch_data['cmc'], arch_data['count'], marker='o', linewidth=2, 
-                         label=get_archetype_name(archetype))
+                ax.plot(arch_data['cmc'], arch_data['count'], marker='o', linewidth=2, 
+                        label=get_archetype_name(archetype))
         
         # Add labels and title
-        plt.xlabel('Mana Value')
-        plt.ylabel('Average Cards per Deck')
-        plt.title('Mana Curves by Archetype')
+        ax.set_xlabel('Mana Value')
+        ax.set_ylabel('Average Cards per Deck')
+        ax.set_title('Mana Curves by Archetype')
         
         # Add legend
-        plt.legend(title='Archetype')
+        ax.legend(title='Archetype')
         
         # Add grid
-        plt.grid(linestyle='--', alpha=0.7)
+        ax.grid(linestyle='--', alpha=0.7)
         
         # Save combined chart
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/combined_mana_curves.png", dpi=300)
-        plt.close()
+        fig.tight_layout()
+        _savefig(fig, f"{output_dir}/combined_mana_curves.{FORMAT}")
+        plt.close(fig)
         
         print(f"Mana curve visualizations saved to {curves_dir} and combined chart saved to {output_dir}")
 
+def _annotated_hist(ax, data, xlabel, title, decimals, bins, range=None):
+    """Draw a histogram of per-deck values with lines at their mean and median, each computed once"""
+    values = np.asarray(data)
+    mean = np.mean(values)
+    median = np.median(values)
+    
+    # Bin with NumPy and let matplotlib only draw the bars
+    counts, edges = np.histogram(values, bins=bins, range=range)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', alpha=0.7)
+    ax.axvline(x=mean, color='red', linestyle='--', label=f'Mean = {mean:.{decimals}f}')
+    ax.axvline(x=median, color='green', linestyle='-', label=f'Median = {median:.{decimals}f}')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Number of Decks')
+    ax.set_title(title)
+    ax.grid(linestyle='--', alpha=0.7)
+
+def _deck_statistics(df):
+    """Return a DataFrame with the type counts, CMC statistics and archetype of every deck"""
+    # Group by deck_id and calculate all the statistics in one pass
+    # (the type flags are summed as uint8 so pandas' integer summer runs on them directly)
+    deck_df = df.assign(cmc=df['cmc'].fillna(0),
+                        **{flag: df[flag].to_numpy(dtype=np.uint8) for flag in ('is_creature', 'is_sorcery', 'is_instant')})
+    if 'archetype' not in deck_df.columns:
+        deck_df['archetype'] = 'unknown'
+    # Factorize deck_id once; the codes follow deck_id order, so the groups need no sorting of their own
+    deck_codes, deck_ids = pd.factorize(deck_df['deck_id'], sort=True)
+    grouped = deck_df.groupby(deck_codes, sort=False)
+    stats_df = grouped.agg(
+        creature_count=('is_creature', 'sum'),
+        sorcery_count=('is_sorcery', 'sum'),
+        instant_count=('is_instant', 'sum'),
+        mean_cmc=('cmc', 'mean'),
+        median_cmc=('cmc', 'median'),
+        archetype=('archetype', 'first'),
+    )
+    # Population standard deviation, as np.std gives (pandas' std defaults to the sample one)
+    stats_df['std_cmc'] = grouped['cmc'].std(ddof=0)
+    
+    # Calculate creature/sorcery/instant ratio (NaN for decks without sorceries or instants)
+    spell_count = stats_df['sorcery_count'] + stats_df['instant_count']
+    stats_df['creature_sorcery_instant_ratio'] = stats_df['creature_count'] / spell_count.where(spell_count > 0)
+    stats_df.insert(0, 'deck_id', deck_ids[stats_df.index])
+    return stats_df
+
 def analyze_deck_statistics(df, output_dir):
     """New function using NumPy to calculate and visualize deck statistics for 23-card decks (non-land cards only)"""
-    if 'type_line' not in df.columns or 'cmc' not in df.columns:
+    # Return before hashing, grouping or creating a figure when there is nothing to analyze
+    if not {'deck_id', 'type_line', 'cmc'}.issubset(df.columns):
         print("Required columns not found for deck statistics analysis")
         return
+    if df.empty:
+        print("No valid deck statistics found")
+        return
+    
+    # Make sure the card type flags exist (load_data already adds them)
+    _add_derived_columns(df)
     
-    # Create card type flags
-    df['is_creature'] = df['type_line'].str.contains('Creature', case=False, na=False)
-    df['is_sorcery'] = df['type_line'].str.contains('Sorcery', case=False, na=False)
-    df['is_instant'] = df['type_line'].str.contains('Instant', case=False, na=False)
-    
-    # Group by deck_id and calculate statistics
-    deck_stats = []
-    for deck_id, deck_data in df.groupby('deck_id'):
-        # Basic metrics
-        creature_count = np.sum(deck_data['is_creature'])
-        sorcery_count = np.sum(deck_data['is_sorcery'])
-        instant_count = np.sum(deck_data['is_instant'])
-        
-        # CMC metrics
-        cmcs = np.array(deck_data['cmc'].fillna(0))
-        mean_cmc = np.mean(cmcs)
-        median_cmc = np.median(cmcs)
-        std_cmc = np.std(cmcs) 
-        
-        # Calculate creature/sorcery/instant ratio
-        if sorcery_count + instant_count > 0:
-            creature_sorcery_instant_ratio = creature_count / (sorcery_count + instant_count)
+    # Reuse the statistics from an earlier run on the same cards, keyed on a hash of the columns they come from
+    key_columns = [col for col in ('deck_id', 'is_creature', 'is_sorcery', 'is_instant', 'cmc', 'archetype') if col in df.columns]
+    key = hashlib.sha256(pd.util.hash_pandas_object(df[key_columns], index=False).to_numpy()).hexdigest()[:16]
+    cache_path = os.path.join(output_dir, f".deck_statistics_{key}.parquet")
+    if os.path.exists(cache_path):
+        stats_df = pd.read_parquet(cache_path)
+    else:
+        stats_df = _deck_statistics(df)
+        try:
+            stats_df.to_parquet(cache_path, index=False)
+        except ImportError:
+            # No Parquet engine installed, so compute the statistics again next time
+            pass
         else:
-            creature_sorcery_instant_ratio = float('inf')
-            
-        deck_stats.append({
-            'deck_id': deck_id,
-            'creature_count': creature_count,
-            'sorcery_count': sorcery_count,
-            'instant_count': instant_count,
-            'mean_cmc': mean_cmc,
-            'median_cmc': median_cmc,
-            'std_cmc': std_cmc,
-            'creature_sorcery_instant_ratio': creature_sorcery_instant_ratio,
-            'archetype': deck_data['archetype'].iloc[0] if 'archetype' in deck_data.columns else 'unknown'
-        })
+            # Statistics of older card data are never read again
+            for old_path in glob.glob(os.path.join(output_dir, ".deck_statistics_*.parquet")):
+                if old_path != cache_path:
+                    os.remove(old_path)
     
-    if not deck_stats:
+    if stats_df.empty:
         print("No valid deck statistics found")
         return
-    
-    # Create DataFrame from deck stats
-    stats_df = pd.DataFrame(deck_stats)
 
     # Create visualizations for deck statistics
-    plt.figure(figsize=(12, 10))
+    fig = plt.figure(figsize=(12, 10))
 
     # 1. Creature count distribution
-    plt.subplot(2, 2, 1)
+    ax = fig.add_subplot(2, 2, 1)
     counts = stats_df['creature_count']
     bins = np.arange(np.min(counts), np.max(counts) + 2) - 0.5
-    plt.hist(counts, bins=bins, alpha=0.7)
-    plt.axvline(x=np.mean(counts), color='red', linestyle='--',
-                label=f'Mean = {np.mean(counts):.1f}')
-    plt.axvline(x=np.median(counts), color='green', linestyle='-',
-               label=f'Median = {np.median(counts):.1f}')
+    _annotated_hist(ax, counts, 'Creature Count (in 23-card deck)', 'Creature Count Distribution', 1, bins=bins)
     ideal_creature_count = 15  # Typical guideline for a 23-card deck
-    plt.axvline(x=ideal_creature_count, color='blue', linestyle=':',
-                label=f'Typical guideline = {ideal_creature_count}')
-    plt.xlabel('Creature Count (in 23-card deck)')
-    plt.ylabel('Number of Decks')
-    plt.title('Creature Count Distribution')
-    plt.legend()
-    plt.grid(linestyle='--', alpha=0.7)
-    plt.tight_layout()
+    ax.axvline(x=ideal_creature_count, color='blue', linestyle=':',
+               label=f'Typical guideline = {ideal_creature_count}')
+    ax.legend()
 
     # 2. Average CMC distribution
-    plt.subplot(2, 2, 2)
-    mean_cmcs = stats_df['mean_cmc']
-    plt.hist(mean_cmcs, bins=20, alpha=0.7)
-    plt.axvline(x=np.mean(mean_cmcs), color='red', linestyle='--',
-                label=f'Mean = {np.mean(mean_cmcs):.2f}')
-    plt.axvline(x=np.median(mean_cmcs), color='green', linestyle='-',
-                label=f'Median = {np.median(mean_cmcs):.2f}')
-    plt.xlabel('Average Mana Value')
-    plt.ylabel('Number of Decks')
-    plt.title('Average Mana Value Distribution')
-    plt.legend()
-    plt.grid(linestyle='--', alpha=0.7)
-    plt.tight_layout()
+    ax = fig.add_subplot(2, 2, 2)
+    _annotated_hist(ax, stats_df['mean_cmc'], 'Average Mana Value', 'Average Mana Value Distribution', 2, bins=20)
+    ax.legend()
 
     # 3. Creature/Sorcery/Instant ratio distribution
-    plt.subplot(2, 2, 3)
-    ratios = stats_df['creature_sorcery_instant_ratio'].replace([np.inf, -np.inf], np.nan).dropna()
-    plt.hist(ratios, bins=20, alpha=0.7, range=(0, 5))
-    plt.axvline(x=np.mean(ratios), color='red', linestyle='--',
-                label=f'Mean = {np.mean(ratios):.2f}')
-    plt.axvline(x=np.median(ratios), color='green', linestyle='-',
-                label=f'Median = {np.median(ratios):.2f}')
-    plt.xlabel('Creature/Sorcery/Instant Ratio')
-    plt.ylabel('Number of Decks')
-    plt.title('Creature/Sorcery/Instant Ratio Distribution')
-    plt.legend()
-    plt.grid(linestyle='--', alpha=0.7)
-    plt.tight_layout()
+    ax = fig.add_subplot(2, 2, 3)
+    ratios = stats_df['creature_sorcery_instant_ratio'].dropna().to_numpy()
+    _annotated_hist(ax, ratios, 'Creature/Sorcery/Instant Ratio', 'Creature/Sorcery/Instant Ratio Distribution', 2,
+                    bins=20, range=(0, 5))
+    ax.legend()
 
     # 4. Archetype by Average CMC
     if 'archetype' in stats_df.columns and stats_df['archetype'].nunique() > 1:
-        plt.subplot(2, 2, 4)
-        arch_cmc = stats_df.groupby('archetype')['mean_cmc'].agg(['mean', 'median', 'std', 'count']).reset_index()
-        arch_cmc = arch_cmc.sort_values('mean', ascending=False)
-
+        ax = fig.add_subplot(2, 2, 4)
         # only include archetypes with sufficient sample size
-        arch_cmc = arch_cmc[arch_cmc['count'] >= 10]
+        arch_cmc = (stats_df.groupby('archetype', sort=False, observed=True)['mean_cmc']
+                    .agg(['mean', 'median', 'std', 'count'])
+                    .query('count >= 10')
+                    .sort_values('mean', ascending=False)
+                    .reset_index())
 
-        # Plot bars for each archetype
+        # Plot the three statistics side by side for each archetype
         x = np.arange(len(arch_cmc))
-        plt.bar(x, arch_cmc['mean'], alpha=0.7, label='Mean CMC', capsize=5)
-        plt.bar(x, arch_cmc['median'], alpha=0.7, label='Median CMC', capsize=5)
-        plt.bar(x, arch_cmc['std'], alpha=0.7, label='Standard Deviation', capsize=5)
+        width = 0.8 / 3
+        for offset, (column, label) in enumerate([('mean', 'Mean CMC'), ('median', 'Median CMC'),
+                                                  ('std', 'Standard Deviation')]):
+            ax.bar(x + (offset - 1) * width, arch_cmc[column], width=width, alpha=0.7, label=label)
 
         # Add labels and title
-        plt.xlabel('Archetype')
-        plt.ylabel('Average Mana Value')
-        plt.title('Average Mana Value by Archetype')
-        plt.xticks(x, arch_cmc['archetype'], rotation=45, ha='right')
-        plt.legend()
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
+        ax.set_xlabel('Archetype')
+        ax.set_ylabel('Average Mana Value')
+        ax.set_title('Average Mana Value by Archetype')
+        ax.set_xticks(x)
+        ax.set_xticklabels(arch_cmc['archetype'], rotation=45, ha='right')
+        ax.legend()
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
         
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/deck_statistics.png", dpi=300)
-    plt.close()
+    fig.tight_layout()
+    _savefig(fig, f"{output_dir}/deck_statistics.png")
+    plt.close(fig)
 
     print(f"Deck statistics visualizations saved to {output_dir}/deck_statistics.png")
     
     
+# Every chart main() draws, with whether it reads the card data frame (or the analysis JSON);
+# PERFORMANCE.md lists the bottleneck class of each one
+PLOTS = [
+    # Standard visualizations
+    (plot_mana_curve, False),
+    (plot_color_distribution, False),
+    (plot_card_frequency, False),
+    (plot_type_distribution, False),
+    (plot_rarity_distribution, False),
+    (plot_deck_color_pairs, True),
+    # Archetype-specific visualizations
+    (plot_archetype_distribution, False),
+    (plot_archetype_performance, True),
+    (plot_archetype_top_cards, False),
+    (plot_archetype_mana_curves, False),
+    # NumPy based analysis
+    (analyze_deck_statistics, True),
+]
+
+# Data for the charts drawn in a worker process, set by _init_worker
+_worker_data = None
+
+def _init_worker(df, analysis, output_dir, dpi, fmt):
+    global _worker_data, DPI, FORMAT
+    plt.switch_backend('Agg')
+    DPI = dpi
+    FORMAT = fmt
+    _worker_data = (df, analysis, output_dir)
+
+def _run_plot_in_worker(task):
+    plot, uses_df = task
+    df, analysis, output_dir = _worker_data
+    plot(df if uses_df else analysis, output_dir)
+
 def main():
+    global DPI, FORMAT
     parser = argparse.ArgumentParser(description='Visualize MTG draft data analysis')
     parser.add_argument('--set', dest='set_code', default='tdm',
                         help='Set code for the draft data (default: tdm)')
+    parser.add_argument('--dpi', type=int, default=DPI,
+                        help='Resolution of the saved charts (default: $VIZ_DPI or 150)')
+    parser.add_argument('--format', dest='fmt', choices=FORMATS, default=FORMAT,
+                        help='File format of the simple charts (default: $VIZ_FORMAT or svg)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='Most worker processes to draw the charts with (default: one per CPU)')
     
     args = parser.parse_args()
+    DPI = args.dpi
+    FORMAT = args.fmt
     
     try:
         # Load the data
@@ -970,25 +1072,19 @@ def main():
         # Create output directory
         output_dir = create_output_dir()
         
-        # Generate standard visualizations
-        plot_mana_curve(analysis, output_dir)
-        plot_color_distribution(analysis, output_dir)
-        plot_card_frequency(analysis, output_dir)
-        plot_type_distribution(analysis, output_dir)
-        plot_rarity_distribution(analysis, output_dir)
-        plot_deck_color_pairs(df, output_dir)
-        
-        # Generate archetype-specific visualizations
-        plot_archetype_distribution(analysis, output_dir)
-        plot_archetype_performance(df, output_dir)
-        plot_archetype_top_cards(analysis, output_dir)
-        plot_archetype_mana_curves(analysis, output_dir)
-
-        # New NumPy based analysis
-        analyze_deck_statistics(df, output_dir)
+        # The charts are independent, so spread them over worker processes that each receive the data once
+        workers = max(1, min(args.jobs or os.cpu_count() or 1, len(PLOTS)))
+        if workers == 1:
+            for plot, uses_df in PLOTS:
+                plot(df if uses_df else analysis, output_dir)
+        else:
+            with multiprocessing.Pool(workers, initializer=_init_worker,
+                                      initargs=(df, analysis, output_dir, DPI, FORMAT)) as pool:
+                for _ in pool.imap_unordered(_run_plot_in_worker, PLOTS):
+                    pass
         
         print(f"All visualizations have been saved to the '{output_dir}' directory")
-        print("To view these visualizations, open the PNG files in any image viewer")
+        print("To view these visualizations, open the files in a web browser or image viewer")
     
     except Exception as e:
         print(f"Error: {e}")